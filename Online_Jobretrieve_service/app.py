@@ -73,6 +73,7 @@ if __name__ == '__main__':
     print(f"   - POST /api/jobs/analytics/skill-trends")
     print(f"   - POST /api/jobs/analytics/location-insights")
     print(f"   - POST /api/jobs/clear-cache")
+    print(f"   - POST /api/jobs/skills/reload")
     print(f"\n   Real-time Job Routes (/api/realtime-jobs):")
     print(f"   - GET  /api/realtime-jobs/health")
     print(f"   - POST /api/realtime-jobs/search")
@@ -84,6 +85,7 @@ if __name__ == '__main__':
     print(f"   - POST /api/realtime-jobs/analytics/skill-trends")
     print(f"   - POST /api/realtime-jobs/analytics/location-insights")
     print(f"   - POST /api/realtime-jobs/clear-cache")
+    print(f"   - POST /api/realtime-jobs/skills/reload")
     print("="*70 + "\n")
 
     app.run(
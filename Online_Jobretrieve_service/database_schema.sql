@@ -14,6 +14,7 @@ CREATE TABLE IF NOT EXISTS retrieveJobs (
     salary_min DECIMAL(10, 2),
     salary_max DECIMAL(10, 2),
     salary_currency VARCHAR(10),
+    salary_period VARCHAR(10), -- year, month, week, day, hour; NULL = as posted
     description TEXT,
     requirements TEXT,
     benefits TEXT,
@@ -28,6 +29,22 @@ CREATE TABLE IF NOT EXISTS retrieveJobs (
     updated_at TIMESTAMP DEFAULT NOW()
 );
 
+-- For databases created before salaries carried a pay period
+ALTER TABLE retrieveJobs ADD COLUMN IF NOT EXISTS salary_period VARCHAR(10);
+
+-- Yearly salary equivalents the salary filters compare against
+-- (multipliers as in job_record.SALARY_PERIODS; no period = as posted)
+ALTER TABLE retrieveJobs ADD COLUMN IF NOT EXISTS annual_salary_min DECIMAL(14, 2) GENERATED ALWAYS AS (
+    CASE WHEN salary_min > 0 THEN salary_min * CASE salary_period
+        WHEN 'month' THEN 12 WHEN 'week' THEN 52 WHEN 'day' THEN 260 WHEN 'hour' THEN 2080
+        ELSE 1 END END
+) STORED;
+ALTER TABLE retrieveJobs ADD COLUMN IF NOT EXISTS annual_salary_max DECIMAL(14, 2) GENERATED ALWAYS AS (
+    CASE WHEN salary_max > 0 THEN salary_max * CASE salary_period
+        WHEN 'month' THEN 12 WHEN 'week' THEN 52 WHEN 'day' THEN 260 WHEN 'hour' THEN 2080
+        ELSE 1 END END
+) STORED;
+
 -- Retrieved Job Skills Table (Many-to-Many relationship)
 CREATE TABLE IF NOT EXISTS retrieveJob_skills (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -43,9 +60,13 @@ CREATE TABLE IF NOT EXISTS skills (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     name VARCHAR(100) UNIQUE NOT NULL,
     category VARCHAR(50), -- programming, framework, tool, soft-skill
+    aliases TEXT[] DEFAULT '{}', -- alternative spellings, e.g. {k8s} for kubernetes
     created_at TIMESTAMP DEFAULT NOW()
 );
 
+-- For databases created before the aliases column existed
+ALTER TABLE skills ADD COLUMN IF NOT EXISTS aliases TEXT[] DEFAULT '{}';
+
 -- Job Fetch Log (Track API calls and status)
 CREATE TABLE IF NOT EXISTS job_fetch_logs (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -85,6 +106,7 @@ CREATE INDEX IF NOT EXISTS idx_retrieveJobs_category ON retrieveJobs(category);
 CREATE INDEX IF NOT EXISTS idx_retrieveJobs_source ON retrieveJobs(source);
 CREATE INDEX IF NOT EXISTS idx_retrieveJobs_posted_date ON retrieveJobs(posted_date DESC);
 CREATE INDEX IF NOT EXISTS idx_retrieveJobs_is_active ON retrieveJobs(is_active);
+CREATE INDEX IF NOT EXISTS idx_retrieveJobs_annual_salary_min ON retrieveJobs(annual_salary_min);
 CREATE INDEX IF NOT EXISTS idx_retrieveJob_skills_skill_name ON retrieveJob_skills(skill_name);
 CREATE INDEX IF NOT EXISTS idx_retrieveJob_applications_user_id ON retrieveJob_applications(user_id);
 
@@ -8,12 +8,14 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any
 import statistics
 
+from skill_taxonomy import SkillTaxonomy, skill_taxonomy
+
 
 class JobAnalytics:
     """Analyzes job data and provides statistics for dashboard"""
 
-    def __init__(self):
-        pass
+    def __init__(self, taxonomy: SkillTaxonomy = None):
+        self.taxonomy = taxonomy or skill_taxonomy
 
     def generate_analytics(self, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -346,44 +348,7 @@ class JobAnalytics:
 
     def _categorize_skill(self, skill: str) -> str:
         """Categorize a skill into broader categories"""
-        skill_lower = skill.lower()
-
-        # Programming languages
-        languages = ['python', 'java', 'javascript', 'typescript', 'go', 'rust', 'c++', 'c#', 'php', 'ruby', 'swift', 'kotlin', 'scala', 'r']
-        if skill_lower in languages:
-            return "Programming Language"
-
-        # Frameworks
-        frameworks = ['react', 'angular', 'vue', 'django', 'flask', 'spring', 'express', 'nodejs', 'laravel', 'rails']
-        if skill_lower in frameworks:
-            return "Framework"
-
-        # Databases
-        databases = ['sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'dynamodb', 'cassandra', 'oracle']
-        if skill_lower in databases or 'sql' in skill_lower:
-            return "Database"
-
-        # Cloud
-        cloud = ['aws', 'azure', 'gcp', 'cloud']
-        if skill_lower in cloud:
-            return "Cloud Platform"
-
-        # DevOps
-        devops = ['docker', 'kubernetes', 'jenkins', 'terraform', 'ansible', 'ci/cd', 'git']
-        if skill_lower in devops:
-            return "DevOps"
-
-        # Testing
-        testing = ['testing', 'jest', 'pytest', 'selenium', 'cypress']
-        if skill_lower in testing or 'test' in skill_lower:
-            return "Testing"
-
-        # Soft skills
-        soft = ['agile', 'scrum', 'leadership', 'communication']
-        if skill_lower in soft:
-            return "Methodology/Soft Skill"
-
-        return "Other"
+        return self.taxonomy.snapshot().category_of(skill)
 
     def get_location_insights(self, jobs: List[Dict]) -> Dict[str, Any]:
         """Get detailed location-based insights"""
@@ -0,0 +1,241 @@
+"""
+Job Cache - Thread-safe, size-bounded LRU cache with TTL expiry
+Used by the real-time service to keep search results in memory
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def _json_default(value: Any) -> Any:
+    # Records such as JobRecord serialize through to_dict()
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if callable(to_dict) else str(value)
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory footprint of a JSON-like value, in bytes"""
+    return len(json.dumps(value, default=_json_default))
+
+
+class _Entry:
+    __slots__ = ("value", "size", "stored_at", "expires_at", "used_at")
+
+    def __init__(self, value: Any, size: int, stored_at: float, expires_at: float):
+        self.value = value
+        self.size = size
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+        self.used_at = stored_at
+
+
+class _Stripe:
+    """One independently locked LRU segment of the cache"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
+    def remove(self, key: Hashable) -> None:
+        entry = self.entries.pop(key)
+        self.bytes -= entry.size
+
+
+class JobCache:
+    """
+    Bounded cache keyed by search, safe to share between Flask worker threads
+
+    - Total size is capped in bytes (estimated from the JSON encoding)
+    - Least recently used entries are evicted first, from whichever stripe
+      holds them, so any value up to max_bytes can be cached
+    - Entries expire ttl_seconds after they are stored
+    - Keys are spread over independently locked stripes to limit contention
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 30 * 60,
+        stripes: int = 16,
+        sizeof: Callable[[Any], int] = estimate_size
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sizeof = sizeof
+        self._stripes = [_Stripe() for _ in range(stripes)]
+        # Values refused for being larger than the whole cache
+        self.rejections = 0
+
+
+    def _stripe(self, key: Hashable) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        stripe = self._stripe(key)
+        now = time.monotonic()
+
+        with stripe.lock:
+            entry = stripe.entries.get(key)
+
+            if entry is None:
+                stripe.misses += 1
+                return None
+
+            if entry.expires_at <= now:
+                stripe.remove(key)
+                stripe.expirations += 1
+                stripe.misses += 1
+                return None
+
+            stripe.entries.move_to_end(key)
+            entry.used_at = now
+            stripe.hits += 1
+            return entry.value
+
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float = None) -> bool:
+        """
+        Store a value, evicting least recently used entries to make room
+        Returns False (and counts a rejection) if the value alone is larger
+        than max_bytes
+        """
+        size = self.sizeof(value)
+        stripe = self._stripe(key)
+        now = time.monotonic()
+
+        with stripe.lock:
+            if key in stripe.entries:
+                stripe.remove(key)
+
+            if size > self.max_bytes:
+                self.rejections += 1
+                return False
+
+            # Expired entries go before any live entry is evicted
+            expired = [k for k, entry in stripe.entries.items() if entry.expires_at <= now]
+            for k in expired:
+                stripe.remove(k)
+            stripe.expirations += len(expired)
+
+            ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+            stripe.entries[key] = _Entry(value, size, now, now + ttl)
+            stripe.bytes += size
+
+        self._evict_over_budget()
+        return True
+
+
+    def _evict_over_budget(self) -> None:
+        """
+        Evict least recently used entries across stripes until the total fits
+        Stripe locks are taken one at a time, never nested
+        """
+        while sum(stripe.bytes for stripe in self._stripes) > self.max_bytes:
+            victim, oldest = None, None
+
+            for stripe in self._stripes:
+                with stripe.lock:
+                    if stripe.entries:
+                        used_at = next(iter(stripe.entries.values())).used_at
+                        if oldest is None or used_at < oldest:
+                            victim, oldest = stripe, used_at
+
+            if victim is None:
+                return
+
+            with victim.lock:
+                if victim.entries:
+                    victim.remove(next(iter(victim.entries)))
+                    victim.evictions += 1
+
+
+    def add_size(self, key: Hashable, value: Any, nbytes: int) -> bool:
+        """
+        Count nbytes more against a stored entry (e.g. an index attached to
+        its value after it was measured), evicting to stay within max_bytes
+        Returns False if key no longer holds this value
+        """
+        stripe = self._stripe(key)
+
+        with stripe.lock:
+            entry = stripe.entries.get(key)
+            if entry is None or entry.value is not value:
+                return False
+
+            entry.size += nbytes
+            stripe.bytes += nbytes
+
+        self._evict_over_budget()
+        return True
+
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a key if present"""
+        stripe = self._stripe(key)
+        with stripe.lock:
+            if key in stripe.entries:
+                stripe.remove(key)
+
+
+    def __contains__(self, key: Hashable) -> bool:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            entry = stripe.entries.get(key)
+            return entry is not None and entry.expires_at > time.monotonic()
+
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)"""
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.bytes = 0
+
+
+    def purge_expired(self) -> int:
+        """Remove expired entries from every stripe; returns how many were removed"""
+        removed = 0
+        now = time.monotonic()
+
+        for stripe in self._stripes:
+            with stripe.lock:
+                expired = [key for key, entry in stripe.entries.items() if entry.expires_at <= now]
+                for key in expired:
+                    stripe.remove(key)
+                stripe.expirations += len(expired)
+                removed += len(expired)
+
+        return removed
+
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size"""
+        totals = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "entries": 0, "bytes": 0}
+
+        for stripe in self._stripes:
+            with stripe.lock:
+                totals["hits"] += stripe.hits
+                totals["misses"] += stripe.misses
+                totals["evictions"] += stripe.evictions
+                totals["expirations"] += stripe.expirations
+                totals["entries"] += len(stripe.entries)
+                totals["bytes"] += stripe.bytes
+
+        totals["rejections"] = self.rejections
+
+        lookups = totals["hits"] + totals["misses"]
+        totals["hit_ratio"] = round(totals["hits"] / lookups, 3) if lookups else 0
+        totals["max_bytes"] = self.max_bytes
+
+        return totals
@@ -0,0 +1,161 @@
+"""
+Job Classifier - Classifies a job's text in one pass
+Skills, experience level, job type, remote signal and salary mentions are
+all found by a single compiled regex, instead of one scan per question
+"""
+
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from skill_matcher import KeywordPattern, keyword_pattern
+
+
+ENTRY_KEYWORDS = [
+    "entry level", "entry-level", "junior", "graduate", "fresher",
+    "0-2 years", "0-1 year", "internship"
+]
+
+SENIOR_KEYWORDS = [
+    "senior", "lead", "principal", "architect",
+    "5+ years", "7+ years", "10+ years", "expert"
+]
+
+# Text signal -> value understood by JobParser._normalize_job_type
+# Only unambiguous phrases: "contract", "intern" or "temporary" appear in
+# ordinary prose ("a contract with the city", "mentor an intern")
+JOB_TYPE_KEYWORDS = {
+    "full-time": "full-time", "full time": "full-time", "fulltime": "full-time",
+    "part-time": "part-time", "part time": "part-time"
+}
+
+REMOTE_KEYWORDS = ["remote", "remotely", "work from home", "wfh"]
+
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP"}
+
+_AMOUNT = r"\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?"
+
+# "$80k - $120k", "€50,000 to 60,000 per year", "$45/hr"
+_SALARY_PATTERN = (
+    rf"(?P<currency>[$€£])\s?(?P<low>{_AMOUNT})\s?(?P<low_k>k\b)?"
+    rf"(?:\s?(?:-|–|to)\s?[$€£]?\s?(?P<high>{_AMOUNT})\s?(?P<high_k>k\b)?)?"
+    r"(?:\s?(?:/|per|an?)\s?(?P<period>hour|hr|year|yr|annum|month|mo)\b)?"
+)
+
+_PERIODS = {"hour": "hour", "hr": "hour", "year": "year", "yr": "year", "annum": "year", "month": "month", "mo": "month"}
+
+
+class SalaryMention(NamedTuple):
+    """A salary amount or range quoted in the text"""
+    low: float
+    high: Optional[float]
+    currency: str
+    period: Optional[str]  # hour, month, year or None if not stated
+    start: int
+    end: int
+
+
+class Classification(NamedTuple):
+    """Everything one pass over a job's text found"""
+    skills: List[str]  # canonical names, in order of first appearance
+    skill_counts: Dict[str, int]
+    experience_level: str  # entry, mid, senior
+    job_type: Optional[str]
+    remote: bool
+    salary_mentions: List[SalaryMention]
+
+
+class JobClassifier:
+    """
+    Combined classifier compiled once per skill vocabulary
+
+    Args:
+        skill_lookup: Skill surface form (name or alias) -> canonical name
+    """
+
+    def __init__(self, skill_lookup: Mapping[str, str]):
+        # Every keyword -> (kind, value); skills take precedence on a clash
+        self._keywords: Dict[str, Tuple[str, str]] = {}
+        for form, skill in skill_lookup.items():
+            self._keywords.setdefault(form.lower(), ("skill", skill))
+        for keyword in ENTRY_KEYWORDS:
+            self._keywords.setdefault(keyword, ("entry", keyword))
+        for keyword in SENIOR_KEYWORDS:
+            self._keywords.setdefault(keyword, ("senior", keyword))
+        for keyword, job_type in JOB_TYPE_KEYWORDS.items():
+            self._keywords.setdefault(keyword, ("job_type", job_type))
+        for keyword in REMOTE_KEYWORDS:
+            self._keywords.setdefault(keyword, ("remote", keyword))
+
+        # All keywords share one trie; salaries start with a currency symbol
+        self._pattern = KeywordPattern(
+            f"(?P<keyword>{keyword_pattern(self._keywords)})|(?P<salary>{_SALARY_PATTERN})"
+        )
+
+
+    def classify(self, text: str) -> Classification:
+        """Classify a job's text (typically title + description)"""
+        skill_counts: Dict[str, int] = {}
+        entry = senior = remote = False
+        job_type = None
+        salary_mentions = []
+
+        for m in self._pattern.finditer(text or ""):
+            if m.lastgroup == "salary":
+                salary_mentions.append(self._salary_mention(m))
+                continue
+
+            kind, value = self._keywords[m.group().lower()]
+
+            if kind == "skill":
+                skill_counts[value] = skill_counts.get(value, 0) + 1
+            elif kind == "entry":
+                entry = True
+            elif kind == "senior":
+                senior = True
+            elif kind == "job_type":
+                job_type = job_type or value
+            else:
+                remote = True
+
+        # Entry-level signals win, as "junior" rarely appears in senior postings
+        experience_level = "entry" if entry else "senior" if senior else "mid"
+
+        return Classification(
+            skills=list(skill_counts),
+            skill_counts=skill_counts,
+            experience_level=experience_level,
+            job_type=job_type,
+            remote=remote,
+            salary_mentions=salary_mentions
+        )
+
+
+    @staticmethod
+    def _salary_mention(m) -> SalaryMention:
+        def amount(value: str, thousands: bool) -> float:
+            return float(value.replace(",", "")) * (1000 if thousands else 1)
+
+        high_k = bool(m.group("high_k"))
+        # "$80-120k": the k applies to both ends
+        low = amount(m.group("low"), bool(m.group("low_k")) or (high_k and "," not in m.group("low")))
+        high = amount(m.group("high"), high_k) if m.group("high") else None
+        period = m.group("period")
+
+        return SalaryMention(
+            low=low,
+            high=high,
+            currency=CURRENCY_SYMBOLS[m.group("currency")],
+            period=_PERIODS[period.lower()] if period else None,
+            start=m.start(),
+            end=m.end()
+        )
+
+
+def annual_salary_range(mentions: List[SalaryMention], minimum: float = 10000) -> Optional[SalaryMention]:
+    """
+    First mention that reads as a yearly salary (stated yearly, or no period
+    and at least `minimum`), or None
+    """
+    for mention in mentions:
+        if mention.period in (None, "year") and mention.low >= minimum:
+            return mention
+    return None
@@ -4,28 +4,215 @@ Supports: JSearch (RapidAPI), Adzuna, Remotive, and Arbeitnow
 """
 
 import os
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Callable, Hashable, List, Dict, Optional, Tuple
 import time
 
+from rate_limiter import RateLimiter, QuotaExceededError
+from job_sources import SOURCE_REGISTRY, get_source
+
+
+# Per-source fetch status values reported by fetch_all_sources_with_status
+SOURCE_OK = "ok"
+SOURCE_TIMED_OUT = "timed_out"
+SOURCE_ERROR = "error"
+SOURCE_SKIPPED = "skipped"
+
+# Upstream responses worth retrying, and the base delay between attempts
+RETRY_STATUSES = frozenset((500, 502, 503, 504))
+RETRY_BACKOFF_SECONDS = 0.3
+
+
+def create_http_session(pool_maxsize: int = 4) -> requests.Session:
+    """
+    Build a keep-alive HTTP session for the upstream job APIs
+
+    - One connection pool per host, keeping up to pool_maxsize idle
+      connections alive; a burst beyond that opens a throwaway connection
+      instead of waiting, since requests gives the pool wait no timeout and
+      a blocked worker would ignore the request deadline
+    - No transport-level retries: JobFetcher retries each GET itself so
+      every attempt's timeout is capped by the request deadline
+    - Advertises every compression urllib3 can decode (gzip/deflate,
+      plus br when the brotli package is installed)
+    """
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=pool_maxsize,
+        max_retries=0,
+        pool_block=False
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept": "application/json",
+        "Accept-Encoding": ACCEPT_ENCODING
+    })
+
+    return session
+
 
 class JobFetcher:
     """Fetches jobs from various job APIs"""
 
-    def __init__(self):
+    # HTTP session shared by every JobFetcher in the process, so the scheduler,
+    # the realtime service and job operations all reuse the same connections
+    _shared_session: Optional[requests.Session] = None
+    _shared_session_lock = threading.Lock()
+
+    # Rate limits and quotas are per API key, so they are shared process-wide too
+    _shared_rate_limiter: Optional[RateLimiter] = None
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
         # API Keys (store in .env file)
         self.jsearch_api_key = os.getenv('RAPIDAPI_KEY')
         self.adzuna_app_id = os.getenv('ADZUNA_APP_ID')
         self.adzuna_app_key = os.getenv('ADZUNA_APP_KEY')
 
+        # Overall deadline for a concurrent multi-source fetch (seconds)
+        self.fetch_timeout = float(os.getenv('JOB_FETCH_TIMEOUT_SECONDS', 20))
+
+        # Per-source HTTP timeouts (seconds); JOB_SOURCE_TIMEOUT_SECONDS overrides all
+        default_timeout = float(os.getenv('JOB_SOURCE_TIMEOUT_SECONDS', 10))
+        self.default_source_timeout = default_timeout
+        self.source_timeouts = {
+            "jsearch": default_timeout,
+            "adzuna": default_timeout,
+            "remotive": default_timeout,
+            "arbeitnow": default_timeout,
+            "themuse": default_timeout
+        }
+
+        # Extra attempts per GET on connection errors and 5xx responses
+        self.http_retries = int(os.getenv('JOB_HTTP_RETRIES', 2))
+
+        self.session = session or self._get_shared_session()
+        self.rate_limiter = rate_limiter or self._get_shared_rate_limiter()
+
+
+    @classmethod
+    def _get_shared_session(cls) -> requests.Session:
+        """Create the process-wide HTTP session on first use"""
+        with cls._shared_session_lock:
+            if cls._shared_session is None:
+                cls._shared_session = create_http_session(
+                    pool_maxsize=int(os.getenv('JOB_HTTP_POOL_MAXSIZE', 4))
+                )
+            return cls._shared_session
+
+
+    @classmethod
+    def _get_shared_rate_limiter(cls) -> RateLimiter:
+        """Create the process-wide rate limiter on first use"""
+        with cls._shared_session_lock:
+            if cls._shared_rate_limiter is None:
+                cls._shared_rate_limiter = RateLimiter()
+            return cls._shared_rate_limiter
+
+
+    def _admit_request(self, source: str, deadline: Optional[float] = None) -> float:
+        """
+        Wait for the source's rate limit, then return the HTTP timeout for
+        its next request, capped by the time left until deadline
+        (a time.monotonic() value)
+
+        Raises QuotaExceededError once the source's monthly quota is used up
+        """
+        if not self.rate_limiter.acquire(source, deadline):
+            raise requests.exceptions.Timeout(f"{source}: rate limit wait exceeds deadline")
+
+        timeout = self.source_timeouts.get(source, self.default_source_timeout)
+
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise requests.exceptions.Timeout(f"{source}: request deadline exceeded")
+            timeout = min(timeout, remaining)
+
+        return timeout
+
+
+    def _get(
+        self,
+        source: str,
+        url: str,
+        deadline: Optional[float] = None,
+        **kwargs
+    ) -> requests.Response:
+        """
+        GET url for a source, retrying connection errors and 5xx responses
+
+        Every attempt goes through _admit_request, so it waits for the rate
+        limit, counts against the quota and gets its timeout recomputed from
+        the time left until deadline. Read timeouts are retried once; a retry
+        whose backoff would end past the deadline is not attempted, and the
+        last response or error is returned or raised instead.
+        """
+        attempt = 0
+        read_retries = 1
+
+        while True:
+            timeout = self._admit_request(source, deadline)
+            try:
+                response = self.session.get(url, timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout) as e:
+                read_timeout = isinstance(e, requests.exceptions.ReadTimeout)
+                if (read_timeout and not read_retries) or not self._retry_after_backoff(attempt, deadline):
+                    raise
+                read_retries -= read_timeout
+            else:
+                if response.status_code not in RETRY_STATUSES or not self._retry_after_backoff(attempt, deadline):
+                    return response
+                response.close()
+
+            attempt += 1
+
+
+    def _retry_after_backoff(self, attempt: int, deadline: Optional[float] = None) -> bool:
+        """Sleep before retry number attempt + 1; False if no retry is left or it won't fit the deadline"""
+        if attempt >= self.http_retries:
+            return False
+
+        delay = RETRY_BACKOFF_SECONDS * (2 ** attempt)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return False
+
+        time.sleep(delay)
+        return True
+
+
+    def _source_available(self, source: str) -> bool:
+        """Check whether a source is registered, configured and within quota"""
+        adapter = get_source(source)
+        if adapter is None or not adapter.is_configured(self):
+            return False
+
+        if not self.rate_limiter.has_quota(source):
+            print(f"[QUOTA] {source}: monthly quota used up, skipping")
+            return False
+
+        return True
+
 
     def fetch_jsearch_jobs(
         self,
         query: str = "software developer",
         location: str = "Bangladesh",
         num_pages: int = 1,
-        employment_types: str = "FULLTIME,PARTTIME,INTERN"
+        employment_types: str = "FULLTIME,PARTTIME,INTERN",
+        deadline: Optional[float] = None,
+        raise_errors: bool = False
     ) -> List[Dict]:
         """
         Fetch jobs from JSearch API (RapidAPI)
@@ -56,7 +243,7 @@ class JobFetcher:
                 querystring["location"] = location
 
             try:
-                response = requests.get(url, headers=headers, params=querystring, timeout=10)
+                response = self._get("jsearch", url, deadline, headers=headers, params=querystring)
                 response.raise_for_status()
                 data = response.json()
 
@@ -66,11 +253,10 @@ class JobFetcher:
                 else:
                     print(f"JSearch: No jobs found for page {page}")
 
-                # Rate limiting - respect API limits
-                time.sleep(1)
-
-            except requests.exceptions.RequestException as e:
+            except (requests.exceptions.RequestException, QuotaExceededError) as e:
                 print(f"Error fetching from JSearch: {e}")
+                if raise_errors and not all_jobs:
+                    raise
                 break
 
         return all_jobs
@@ -81,7 +267,9 @@ class JobFetcher:
         query: str = "developer",
         location: str = "bangladesh",
         results_per_page: int = 50,
-        max_pages: int = 2
+        max_pages: int = 2,
+        deadline: Optional[float] = None,
+        raise_errors: bool = False
     ) -> List[Dict]:
         """
         Fetch jobs from Adzuna API
@@ -131,7 +319,7 @@ class JobFetcher:
                 params["where"] = location
 
             try:
-                response = requests.get(url, params=params, timeout=10)
+                response = self._get("adzuna", url, deadline, params=params)
                 response.raise_for_status()
                 data = response.json()
 
@@ -142,16 +330,21 @@ class JobFetcher:
                     print(f"Adzuna: No jobs found for page {page}")
                     break
 
-                time.sleep(0.5)
-
-            except requests.exceptions.RequestException as e:
+            except (requests.exceptions.RequestException, QuotaExceededError) as e:
                 print(f"Error fetching from Adzuna: {e}")
+                if raise_errors and not all_jobs:
+                    raise
                 break
 
         return all_jobs
 
 
-    def fetch_remotive_jobs(self, category: str = "software-dev") -> List[Dict]:
+    def fetch_remotive_jobs(
+        self,
+        category: str = "software-dev",
+        deadline: Optional[float] = None,
+        raise_errors: bool = False
+    ) -> List[Dict]:
         """
         Fetch jobs from Remotive API (Remote jobs)
         Free, no authentication required
@@ -165,7 +358,7 @@ class JobFetcher:
         }
 
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self._get("remotive", url, deadline, params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -173,12 +366,19 @@ class JobFetcher:
             print(f"Remotive: Fetched {len(jobs)} jobs")
             return jobs
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, QuotaExceededError) as e:
             print(f"Error fetching from Remotive: {e}")
+            if raise_errors:
+                raise
             return []
 
 
-    def fetch_arbeitnow_jobs(self, query: str = "python developer") -> List[Dict]:
+    def fetch_arbeitnow_jobs(
+        self,
+        query: str = "python developer",
+        deadline: Optional[float] = None,
+        raise_errors: bool = False
+    ) -> List[Dict]:
         """
         Fetch jobs from Arbeitnow API
         Free, no authentication required
@@ -187,7 +387,7 @@ class JobFetcher:
         url = "https://www.arbeitnow.com/api/job-board-api"
 
         try:
-            response = requests.get(url, timeout=10)
+            response = self._get("arbeitnow", url, deadline)
             response.raise_for_status()
             data = response.json()
 
@@ -205,8 +405,10 @@ class JobFetcher:
             print(f"Arbeitnow: Fetched {len(jobs)} jobs")
             return jobs
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, QuotaExceededError) as e:
             print(f"Error fetching from Arbeitnow: {e}")
+            if raise_errors:
+                raise
             return []
 
 
@@ -214,7 +416,9 @@ class JobFetcher:
         self,
         category: str = "Software Engineering",
         location: str = "",
-        page: int = 0
+        page: int = 0,
+        deadline: Optional[float] = None,
+        raise_errors: bool = False
     ) -> List[Dict]:
         """
         Fetch jobs from The Muse API
@@ -232,7 +436,7 @@ class JobFetcher:
             params["location"] = location
 
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self._get("themuse", url, deadline, params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -240,53 +444,216 @@ class JobFetcher:
             print(f"The Muse: Fetched {len(jobs)} jobs")
             return jobs
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, QuotaExceededError) as e:
             print(f"Error fetching from The Muse: {e}")
+            if raise_errors:
+                raise
             return []
 
 
-    def fetch_all_sources(
+    def _source_tasks(
+        self,
+        query: str,
+        location: str,
+        sources: Optional[List[str]] = None
+    ) -> Dict[str, Callable[[Optional[float]], List[Dict]]]:
+        """
+        Build one fetch callable per requested source, taking the deadline
+        Keys are in registry order; the callables raise on failure
+        """
+        return {
+            name: (lambda deadline, adapter=adapter: adapter.fetch(self, query, location, deadline))
+            for name, adapter in SOURCE_REGISTRY.items()
+            if sources is None or name in sources
+        }
+
+
+    def _status_for_error(self, error: Exception) -> str:
+        """Map a fetch exception to a per-source status"""
+        if isinstance(error, requests.exceptions.Timeout):
+            return SOURCE_TIMED_OUT
+        if isinstance(error, QuotaExceededError):
+            return SOURCE_SKIPPED
+        return SOURCE_ERROR
+
+
+    def _fetch_sequentially(
+        self,
+        tasks: Dict[str, Callable[[Optional[float]], List[Dict]]],
+        deadline: Optional[float] = None
+    ) -> Tuple[Dict[str, List[Dict]], Dict[str, str]]:
+        """
+        Run fetch tasks one after another under one overall deadline
+        Each task gets the deadline, so every page it requests goes through
+        _admit_request: it is refused once no time is left, and its HTTP
+        timeout is capped by the time remaining
+        """
+        results = {source: [] for source in tasks}
+        status = {}
+
+        for source, task in tasks.items():
+            if deadline is not None and time.monotonic() >= deadline:
+                status[source] = SOURCE_TIMED_OUT
+                continue
+
+            print(f"[->] Fetching from {source}...")
+            try:
+                results[source] = task(deadline)
+                status[source] = SOURCE_OK
+            except Exception as e:
+                status[source] = self._status_for_error(e)
+
+        return results, status
+
+
+    def _fetch_concurrently(
+        self,
+        tasks: Dict[Hashable, Callable[[Optional[float]], List[Dict]]],
+        deadline: float
+    ) -> Tuple[Dict[Hashable, List[Dict]], Dict[Hashable, str]]:
+        """
+        Run fetch tasks in a thread pool under one overall deadline
+        Results are merged as each source finishes; sources still running
+        when the deadline passes are reported as timed out with no jobs
+        """
+        results = {source: [] for source in tasks}
+        status = {source: SOURCE_TIMED_OUT for source in tasks}
+        pending = set(tasks)
+
+        executor = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="job-fetch")
+        futures = {executor.submit(task, deadline): source for source, task in tasks.items()}
+
+        try:
+            for future in as_completed(futures, timeout=max(0, deadline - time.monotonic())):
+                source = futures[future]
+                pending.discard(source)
+
+                try:
+                    results[source] = future.result()
+                    status[source] = SOURCE_OK
+                except Exception as e:
+                    print(f"Error fetching from {source}: {e}")
+                    status[source] = self._status_for_error(e)
+
+        except FuturesTimeoutError:
+            print(f"[WARN] Fetch deadline reached, still waiting on: {', '.join(sorted(map(str, pending)))}")
+
+        finally:
+            # Don't block on stragglers; their HTTP timeouts are capped by the same deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results, status
+
+
+    def fetch_all_sources_with_status(
         self,
         query: str = "software developer",
-        location: str = "Bangladesh"
-    ) -> Dict[str, List[Dict]]:
+        location: str = "Bangladesh",
+        concurrent: bool = True,
+        deadline_ms: Optional[int] = None,
+        sources: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, List[Dict]], Dict[str, str]]:
         """
-        Fetch jobs from all available sources
-        Returns a dictionary with source name as key and jobs list as value
+        Fetch jobs from all available sources within a latency budget
+
+        Args:
+            query: Job search query
+            location: Location to search
+            concurrent: Fetch all sources at once (default) or one after another
+            sources: Only fetch these sources (default: every registered source);
+                     unknown names are ignored
+            deadline_ms: Latency budget in milliseconds
+                         (default: JOB_FETCH_TIMEOUT_SECONDS)
+
+        Returns:
+            Tuple of (jobs by source, status by source), where status is one of
+            "ok", "timed_out", "error" or "skipped" (credentials not configured
+            or monthly quota used up)
         """
         print(f"\n[*] Fetching jobs for: {query} in {location}\n")
 
-        results = {
-            "jsearch": [],
-            "adzuna": [],
-            "remotive": [],
-            "arbeitnow": [],
-            "themuse": []
-        }
-
-        # Fetch from JSearch
-        print("[->] Fetching from JSearch...")
-        results["jsearch"] = self.fetch_jsearch_jobs(query, location, num_pages=1)
+        budget = deadline_ms / 1000 if deadline_ms else self.fetch_timeout
+        deadline = time.monotonic() + budget
 
-        # Fetch from Adzuna
-        print("[->] Fetching from Adzuna...")
-        results["adzuna"] = self.fetch_adzuna_jobs(query, location, max_pages=1)
+        tasks = self._source_tasks(query, location, sources)
+        order = list(tasks)
+        skipped = [source for source in order if not self._source_available(source)]
+        for source in skipped:
+            del tasks[source]
 
-        # Fetch from Remotive
-        print("[->] Fetching from Remotive...")
-        results["remotive"] = self.fetch_remotive_jobs()
+        if concurrent and tasks:
+            results, status = self._fetch_concurrently(tasks, deadline)
+        else:
+            results, status = self._fetch_sequentially(tasks, deadline)
 
-        # Fetch from Arbeitnow
-        print("[->] Fetching from Arbeitnow...")
-        results["arbeitnow"] = self.fetch_arbeitnow_jobs(query)
+        for source in skipped:
+            results[source] = []
+            status[source] = SOURCE_SKIPPED
 
-        # Fetch from The Muse
-        print("[->] Fetching from The Muse...")
-        results["themuse"] = self.fetch_themuse_jobs(category="Software Engineering")
+        results = {source: results[source] for source in order}
+        status = {source: status[source] for source in order}
 
         total_jobs = sum(len(jobs) for jobs in results.values())
         print(f"\n[OK] Total jobs fetched: {total_jobs}\n")
 
+        return results, status
+
+
+    def fetch_upstream_requests(
+        self,
+        requests_by_key: Dict[Hashable, Tuple[str, str, str]],
+        deadline_ms: Optional[int] = None
+    ) -> Tuple[Dict[Hashable, List[Dict]], Dict[Hashable, str]]:
+        """
+        Run a planned set of upstream requests concurrently, each exactly once
+
+        Args:
+            requests_by_key: (source, query, location) per request key, usually
+                             keyed by JobSource.upstream_key()
+            deadline_ms: Latency budget in milliseconds for the whole set
+
+        Returns:
+            Tuple of (raw jobs by key, status by key). Jobs are unfiltered
+            (JobSource.fetch_raw), so locally filtered boards come back whole.
+        """
+        budget = deadline_ms / 1000 if deadline_ms else self.fetch_timeout
+        deadline = time.monotonic() + budget
+
+        tasks = {}
+        status = {}
+        for key, (source, query, location) in requests_by_key.items():
+            if not self._source_available(source):
+                status[key] = SOURCE_SKIPPED
+                continue
+
+            adapter = get_source(source)
+            tasks[key] = (
+                lambda deadline, adapter=adapter, query=query, location=location:
+                adapter.fetch_raw(self, query, location, deadline)
+            )
+
+        results = {key: [] for key in requests_by_key}
+        if tasks:
+            fetched, fetched_status = self._fetch_concurrently(tasks, deadline)
+            results.update(fetched)
+            status.update(fetched_status)
+
+        return results, status
+
+
+    def fetch_all_sources(
+        self,
+        query: str = "software developer",
+        location: str = "Bangladesh",
+        concurrent: bool = True,
+        deadline_ms: Optional[int] = None,
+        sources: Optional[List[str]] = None
+    ) -> Dict[str, List[Dict]]:
+        """
+        Fetch jobs from all available sources (or only the given ones)
+        Returns a dictionary with source name as key and jobs list as value
+        """
+        results, _ = self.fetch_all_sources_with_status(query, location, concurrent, deadline_ms, sources)
         return results
 
 
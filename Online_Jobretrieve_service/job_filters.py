@@ -0,0 +1,270 @@
+"""
+Job Filters - Compiles a filters dict into a predicate pipeline
+Both job blueprints filter cached search results with the same criteria;
+compiling them once per request leaves only key comparisons per job, and
+the same compiled filter pushes down to Supabase for stored jobs
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from job_record import JobRecord, skill_registry
+from skill_taxonomy import skill_taxonomy
+
+
+# Keeps the jobs passing one filter, in order
+Stage = Callable[[List[JobRecord]], List[JobRecord]]
+
+# Relative cost of each check; cheap, selective comparisons run first
+_COSTS = {
+    "remote": 0, "job_type": 0, "experience_level": 0, "source": 0, "category": 0, "is_active": 0,
+    "min_salary": 1, "max_salary": 1,
+    "skills": 2,
+    "company": 3, "location": 3
+}
+
+# Embedded join used to push a skills filter down to retrieveJobs
+SKILLS_EMBED = "retrieveJob_skills!inner(skill_name)"
+
+
+def _text(filters: Dict, key: str) -> Optional[str]:
+    value = filters.get(key)
+    return str(value).lower() if value not in (None, "") else None
+
+
+class JobFilter:
+    """
+    Compiled job filters
+
+    Supported filters:
+    - job_type: full-time, part-time, contract, internship
+    - experience_level: entry, mid, senior
+    - remote: true/false
+    - min_salary / max_salary: yearly amounts
+    - skills: list of skills or aliases (job must have at least one)
+    - company: company name (partial match)
+    - location: location (partial match)
+    - source, category, is_active: exact match
+    """
+
+    def __init__(self, filters: Dict = None):
+        filters = filters or {}
+
+        self.job_type = _text(filters, "job_type")
+        self.experience_level = _text(filters, "experience_level")
+        self.source = _text(filters, "source")
+        self.category = _text(filters, "category")
+        self.company = _text(filters, "company")
+        self.location = _text(filters, "location")
+        self.remote = str(filters["remote"]).lower() == "true" if filters.get("remote") is not None else None
+        self.is_active = filters.get("is_active")
+        self.min_salary = float(filters["min_salary"]) if filters.get("min_salary") is not None else None
+        self.max_salary = float(filters["max_salary"]) if filters.get("max_salary") is not None else None
+        self.skills = self._skill_names(filters.get("skills") or [])
+
+        # Registry ids of the requested skills; names no job has been parsed
+        # with have no id and can't match
+        self.skill_ids = frozenset(
+            skill_id for skill_id in (skill_registry.find(name.lower()) for name in self.skills)
+            if skill_id is not None
+        ) if self.skills else None
+
+        self._stages: List[Tuple[str, Stage]] = sorted(self._build_stages(), key=lambda item: _COSTS[item[0]])
+
+
+    @staticmethod
+    def _skill_names(skills: Iterable[str]) -> List[str]:
+        """Requested skills plus their taxonomy display names ("k8s" also matches "Kubernetes")"""
+        snapshot = skill_taxonomy.snapshot()
+        names = []
+
+        for skill in skills:
+            for name in (skill.strip(), snapshot.display_name(skill.strip())):
+                if name and name not in names:
+                    names.append(name)
+
+        return names
+
+
+    def _build_stages(self) -> List[Tuple[str, Stage]]:
+        """(filter name, stage) for every filter in use"""
+        stages = []
+
+        if self.remote is not None:
+            remote = self.remote
+            stages.append(("remote", lambda jobs: [job for job in jobs if bool(job.get("remote", False)) == remote]))
+
+        if self.job_type is not None:
+            job_type = self.job_type
+            stages.append(("job_type", lambda jobs: [job for job in jobs if job.job_type_key == job_type]))
+
+        if self.experience_level is not None:
+            level = self.experience_level
+            stages.append(("experience_level", lambda jobs: [job for job in jobs if job.experience_level_key == level]))
+
+        if self.source is not None:
+            source = self.source
+            stages.append(("source", lambda jobs: [job for job in jobs if str(job.get("source") or "").lower() == source]))
+
+        if self.category is not None:
+            category = self.category
+            stages.append((
+                "category",
+                lambda jobs: [job for job in jobs if str(job.get("category") or "").lower() == category]
+            ))
+
+        if self.is_active is not None:
+            is_active = self.is_active
+            stages.append(("is_active", lambda jobs: [job for job in jobs if job.get("is_active", True) == is_active]))
+
+        stages.extend(self._salary_stages())
+
+        if self.skill_ids is not None:
+            required = self.skill_ids
+            stages.append(("skills", lambda jobs: [job for job in jobs if not job.skill_keys.isdisjoint(required)]))
+
+        if self.company is not None:
+            company = self.company
+            stages.append(("company", lambda jobs: [job for job in jobs if company in job.company_key]))
+
+        if self.location is not None:
+            location = self.location
+            stages.append(("location", lambda jobs: [job for job in jobs if location in job.location_key]))
+
+        return stages
+
+
+    def _salary_stages(self) -> List[Tuple[str, Stage]]:
+        stages = []
+
+        if self.min_salary is not None:
+            min_salary = self.min_salary
+            stages.append((
+                "min_salary",
+                lambda jobs: [
+                    job for job in jobs
+                    if job.annual_salary_min is not None and job.annual_salary_min >= min_salary
+                ]
+            ))
+
+        if self.max_salary is not None:
+            max_salary = self.max_salary
+            stages.append((
+                "max_salary",
+                lambda jobs: [
+                    job for job in jobs
+                    if job.annual_salary_max is not None and job.annual_salary_max <= max_salary
+                ]
+            ))
+
+        return stages
+
+
+    def __bool__(self) -> bool:
+        return bool(self._stages)
+
+
+    def matches(self, job: Dict) -> bool:
+        """Whether a job passes every filter"""
+        return bool(self.apply([job]))
+
+
+    def apply(self, jobs: Iterable[Dict], skip: Iterable[str] = ()) -> List[Dict]:
+        """
+        Jobs passing every filter, in their original order
+        Each stage runs over the survivors of the previous one, so the
+        cheap ones narrow the list before the substring checks see it.
+        Plain dicts (database rows) are compared through a JobRecord but
+        returned as they were passed in. Filters named in skip (already
+        answered elsewhere, e.g. by a JobIndex) are not checked.
+        """
+        jobs = list(jobs)
+        stages = [stage for name, stage in self._stages if name not in skip]
+        if not stages:
+            return jobs
+
+        originals = None
+        if not all(isinstance(job, JobRecord) for job in jobs):
+            records = [job if isinstance(job, JobRecord) else JobRecord(job) for job in jobs]
+            originals = {id(record): job for record, job in zip(records, jobs)}
+            jobs = records
+
+        for stage in stages:
+            jobs = stage(jobs)
+            if not jobs:
+                break
+
+        return [originals[id(job)] for job in jobs] if originals is not None else jobs
+
+
+    # Supabase pushdown
+
+    def select_columns(self, columns: str = "*") -> str:
+        """retrieveJobs select list, joining job skills when filtering on them"""
+        return f"{columns}, {SKILLS_EMBED}" if self.skills else columns
+
+
+    def apply_to_query(self, query: Any) -> Any:
+        """
+        Add the filters to a retrieveJobs query as PostgREST clauses
+        The query must select select_columns(). Salary bounds compare
+        against the annual_salary_min/max columns, which the database
+        derives from salary_min/max and salary_period like JobRecord does.
+        """
+        if self.remote is not None:
+            query = query.eq("remote", self.remote)
+
+        if self.job_type is not None:
+            query = query.eq("job_type", self.job_type)
+
+        if self.experience_level is not None:
+            query = query.eq("experience_level", self.experience_level)
+
+        if self.source is not None:
+            query = query.eq("source", self.source)
+
+        if self.category is not None:
+            query = query.ilike("category", self.category)
+
+        if self.is_active is not None:
+            query = query.eq("is_active", self.is_active)
+
+        if self.min_salary is not None:
+            query = query.gte("annual_salary_min", self.min_salary)
+
+        if self.max_salary is not None:
+            query = query.lte("annual_salary_max", self.max_salary)
+
+        if self.skills:
+            query = query.in_("retrieveJob_skills.skill_name", self.skills)
+
+        if self.company is not None:
+            query = query.ilike("company", f"%{self.company}%")
+
+        if self.location is not None:
+            query = query.ilike("location", f"%{self.location}%")
+
+        return query
+
+
+    def apply_residual(self, rows: List[Dict]) -> List[Dict]:
+        """
+        Finish rows returned by a query built with apply_to_query
+        Every filter runs in the database; this drops the embedded skills
+        join, which is only there to filter on
+        """
+        for row in rows:
+            row.pop("retrieveJob_skills", None)
+
+        return rows
+
+
+def compile_filters(filters: Dict = None) -> JobFilter:
+    """Compile a filters dict once for use on many jobs"""
+    return filters if isinstance(filters, JobFilter) else JobFilter(filters)
+
+
+def filter_jobs(jobs: List[Dict], filters: Dict) -> List[Dict]:
+    """Filter jobs based on criteria (see JobFilter)"""
+    if not filters:
+        return jobs
+    return compile_filters(filters).apply(jobs)
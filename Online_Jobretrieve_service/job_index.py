@@ -0,0 +1,166 @@
+"""
+Job Index - Bitmap indexes over one cached result set
+A cached search is filtered many times with different criteria; per-value
+bitmaps (Python ints, bit i = job i) turn the common filters into a few
+integer ANDs and give facet counts for every dimension as popcounts
+"""
+
+import sys
+from typing import Dict, Hashable, Iterator, List, Optional
+
+from job_filters import JobFilter
+from job_record import JobRecord, skill_registry
+
+
+# Dimensions answered from bitmaps, also reported as facets
+DIMENSIONS = ("job_type", "experience_level", "remote", "source", "category", "skill")
+
+# JobFilter attributes answered by the index; any other filter runs on the candidates
+INDEXED_FILTERS = ("job_type", "experience_level", "remote", "source", "category", "skills")
+
+
+def _bitmap(positions: List[int], size: int) -> int:
+    """Bitmap with the given bits set, built in one pass"""
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _positions(bitmap: int) -> Iterator[int]:
+    """Indexes of the set bits, lowest first"""
+    bits = format(bitmap, "b")[::-1]
+    position = bits.find("1")
+    while position != -1:
+        yield position
+        position = bits.find("1", position + 1)
+
+
+class JobIndex:
+    """
+    Bitmap index of a list of jobs (the list must not change afterwards)
+
+    Values are stored by their normalized filter key (lowercase strings,
+    skill registry ids); facets report the value as first seen in a job.
+    """
+
+    def __init__(self, jobs: List[Dict]):
+        self.jobs = jobs
+        self.records = [job if isinstance(job, JobRecord) else JobRecord(job) for job in jobs]
+        self.all = (1 << len(jobs)) - 1
+
+        records = self.records
+        positions: Dict[str, Dict[Hashable, List[int]]] = {}
+        self._labels: Dict[str, Dict[Hashable, str]] = {}
+
+        # Scalar dimensions: (dimension, key per job, field the label comes from)
+        scalar_keys = (
+            ("job_type", [record.job_type_key for record in records], "job_type"),
+            ("experience_level", [record.experience_level_key for record in records], "experience_level"),
+            ("remote", [bool(getattr(record, "remote", False)) for record in records], None),
+            ("source", [str(getattr(record, "source", "") or "").lower() for record in records], "source"),
+            ("category", [str(getattr(record, "category", "") or "").lower() for record in records], "category"),
+        )
+
+        for dimension, keys, field in scalar_keys:
+            grouped = positions[dimension] = {}
+            for position, key in enumerate(keys):
+                if key != "":
+                    grouped.setdefault(key, []).append(position)
+
+            self._labels[dimension] = {
+                key: getattr(records[found[0]], field) if field else str(key).lower()
+                for key, found in grouped.items()
+            }
+
+        # Skills: skill_keys holds the ids of the lowercased names in skill_ids
+        grouped = positions["skill"] = {}
+        labels = self._labels["skill"] = {}
+        lowercase_id: Dict[int, int] = {}
+
+        for position, record in enumerate(records):
+            for skill_id in getattr(record, "skill_ids", None) or ():
+                key = lowercase_id.get(skill_id)
+                if key is None:
+                    name = skill_registry.names((skill_id,))[0]
+                    key = lowercase_id[skill_id] = skill_registry.id_of(name.lower())
+                    labels.setdefault(key, name)
+                grouped.setdefault(key, []).append(position)
+
+        self._bitmaps: Dict[str, Dict[Hashable, int]] = {
+            dimension: {key: _bitmap(found, len(jobs)) for key, found in grouped.items()}
+            for dimension, grouped in positions.items()
+        }
+
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the index beyond the jobs themselves"""
+        size = sys.getsizeof(self.records) + sys.getsizeof(self.all)
+        for dimension, bitmaps in self._bitmaps.items():
+            size += sys.getsizeof(bitmaps) + sys.getsizeof(self._labels[dimension])
+            size += sum(sys.getsizeof(bitmap) for bitmap in bitmaps.values())
+        return size
+
+
+    def bitmap(self, dimension: str, key: Hashable) -> int:
+        return self._bitmaps[dimension].get(key, 0)
+
+
+    def select(self, job_filter: JobFilter) -> int:
+        """Bitmap of the jobs passing job_filter"""
+        selected = self.all
+
+        if job_filter.job_type is not None:
+            selected &= self.bitmap("job_type", job_filter.job_type)
+        if job_filter.experience_level is not None:
+            selected &= self.bitmap("experience_level", job_filter.experience_level)
+        if job_filter.remote is not None:
+            selected &= self.bitmap("remote", job_filter.remote)
+        if job_filter.source is not None:
+            selected &= self.bitmap("source", job_filter.source)
+        if job_filter.category is not None:
+            selected &= self.bitmap("category", job_filter.category)
+
+        if job_filter.skill_ids is not None:
+            any_skill = 0
+            for skill_id in job_filter.skill_ids:
+                any_skill |= self.bitmap("skill", skill_id)
+            selected &= any_skill
+
+        if not selected:
+            return 0
+
+        # Salary, company, location, ... on the remaining candidates only
+        candidates = [self.records[position] for position in _positions(selected)]
+        survivors = job_filter.apply(candidates, skip=INDEXED_FILTERS)
+        if len(survivors) == len(candidates):
+            return selected
+
+        position_of = {id(record): position for position, record in zip(_positions(selected), candidates)}
+        selected = 0
+        for record in survivors:
+            selected |= 1 << position_of[id(record)]
+        return selected
+
+
+    def jobs_for(self, bitmap: int) -> List[Dict]:
+        """The jobs in a bitmap, in list order"""
+        return [self.jobs[position] for position in _positions(bitmap)]
+
+
+    def facets(self, bitmap: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+        """Count of jobs per value of every dimension, within bitmap (default: all jobs)"""
+        bitmap = self.all if bitmap is None else bitmap
+        facets = {}
+
+        for dimension in DIMENSIONS:
+            labels = self._labels[dimension]
+            counts = {}
+            for key, jobs in self._bitmaps[dimension].items():
+                count = (jobs & bitmap).bit_count()
+                if count:
+                    counts[labels[key]] = count
+            facets[dimension] = dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+        return facets
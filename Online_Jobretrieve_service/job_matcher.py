@@ -0,0 +1,243 @@
+"""
+Job Matcher - Scores jobs against a user's skills with NumPy
+Each result set becomes a packed jobs x skills bit matrix with posting lists
+(skill -> jobs that list it). Only jobs sharing a skill with the user are
+scored, by popcounting the AND of their rows with the user's packed row, so
+the cost follows the user's skill neighbourhood rather than the pool size
+"""
+
+import sys
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from job_record import JobRecord, skill_registry
+from skill_taxonomy import skill_taxonomy
+
+
+# Set bits per byte value, for NumPy versions without np.bitwise_count
+_BYTE_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+_NO_POSITIONS = np.zeros(0, dtype=np.int64)
+
+
+def _popcount_rows(bits: np.ndarray) -> np.ndarray:
+    """Set bits in each row of a packed uint8 matrix"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.int32)
+    return _BYTE_POPCOUNT[bits].sum(axis=1, dtype=np.int32)
+
+
+def user_skill_ids(user_skills: Iterable[str]) -> frozenset:
+    """
+    Skill registry ids of a user's skills, case-insensitive
+    Aliases resolve through the taxonomy ("k8s" matches Kubernetes)
+    """
+    snapshot = skill_taxonomy.snapshot()
+    ids = set()
+
+    for skill in user_skills:
+        skill = skill.strip()
+        for name in (skill, snapshot.display_name(skill)):
+            skill_id = skill_registry.find(name.lower())
+            if skill_id is not None:
+                ids.add(skill_id)
+
+    return frozenset(ids)
+
+
+def user_skill_names(user_skills: Iterable[str]) -> List[str]:
+    """
+    Spellings a stored job may use for a user's skills: as given, the
+    taxonomy display name and lowercase (for exact-match database lookups)
+    """
+    snapshot = skill_taxonomy.snapshot()
+    names = []
+
+    for skill in user_skills:
+        skill = skill.strip()
+        for name in (skill, snapshot.display_name(skill), skill.lower()):
+            if name and name not in names:
+                names.append(name)
+
+    return names
+
+
+class SkillMatrix:
+    """
+    Packed bit matrix and posting lists of a list of jobs' skills
+
+    Columns are the distinct (lowercased) skills of these jobs, so the width
+    stays small however large the process-wide skill registry grows. The
+    job list must not change afterwards.
+    """
+
+    def __init__(self, jobs: List[Dict]):
+        self.jobs = jobs
+        self.records = [job if isinstance(job, JobRecord) else JobRecord(job) for job in jobs]
+
+        key_sets = [record.skill_keys for record in self.records]
+        self.skill_counts = np.fromiter(map(len, key_sets), dtype=np.int32, count=len(key_sets))
+        ids = np.fromiter(chain.from_iterable(key_sets), dtype=np.int64, count=int(self.skill_counts.sum()))
+        rows = np.repeat(np.arange(len(jobs), dtype=np.int64), self.skill_counts)
+
+        # Sorted vocabulary of skill ids; columns[i] is the column of ids[i]
+        self.vocabulary, columns = np.unique(ids, return_inverse=True)
+
+        dense = np.zeros((len(jobs), len(self.vocabulary)), dtype=bool)
+        dense[rows, columns] = True
+        self.bits = np.packbits(dense, axis=1)
+
+        # Posting lists: the jobs of column c are postings[offsets[c]:offsets[c + 1]]
+        self._postings = rows[np.argsort(columns, kind="stable")]
+        self._offsets = np.concatenate(([0], np.cumsum(np.bincount(columns, minlength=len(self.vocabulary)))))
+
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the matrix beyond the jobs themselves"""
+        arrays = (self.skill_counts, self.vocabulary, self.bits, self._postings, self._offsets)
+        return sys.getsizeof(self.records) + sum(array.nbytes for array in arrays)
+
+
+    def columns_of(self, skill_ids: Iterable[int]) -> np.ndarray:
+        """Columns of the given skill ids that appear in these jobs"""
+        ids = np.fromiter(skill_ids, dtype=np.int64)
+        if not len(ids) or not len(self.vocabulary):
+            return _NO_POSITIONS
+
+        columns = np.searchsorted(self.vocabulary, ids)
+        known = columns < len(self.vocabulary)
+        known[known] = self.vocabulary[columns[known]] == ids[known]
+        return columns[known]
+
+
+    def user_row(self, columns: np.ndarray) -> np.ndarray:
+        """Packed row with the given columns set"""
+        row = np.zeros(len(self.vocabulary), dtype=bool)
+        row[columns] = True
+        return np.packbits(row)
+
+
+    def candidates(self, columns: np.ndarray) -> np.ndarray:
+        """Positions of the jobs listing at least one of the columns, ascending"""
+        if not len(columns):
+            return _NO_POSITIONS
+
+        return np.unique(np.concatenate([
+            self._postings[self._offsets[column]:self._offsets[column + 1]] for column in columns
+        ]))
+
+
+    def score(self, skill_ids: Iterable[int], min_match_percentage: float = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (positions, match percentages) of the jobs sharing a skill with the
+        user and reaching min_match_percentage
+        """
+        columns = self.columns_of(skill_ids)
+        positions = self.candidates(columns)
+        if not len(positions):
+            return positions, np.zeros(0, dtype=np.float64)
+
+        # Drop jobs that can't reach the minimum even if every user skill matched
+        counts = self.skill_counts[positions]
+        if min_match_percentage > 0:
+            reachable = np.minimum(counts, len(columns)) * 100.0 / counts >= min_match_percentage
+            positions, counts = positions[reachable], counts[reachable]
+
+        matched = _popcount_rows(self.bits[positions] & self.user_row(columns))
+        percentages = np.round(matched * 100.0 / counts, 2)
+
+        passing = percentages >= min_match_percentage
+        return positions[passing], percentages[passing]
+
+
+def _top(percentages: np.ndarray, order_keys: Sequence[np.ndarray], limit: Optional[int]) -> np.ndarray:
+    """
+    Indexes into percentages, highest first, ties by order_keys (most significant first)
+    With a limit only the entries at or above the limit-th best percentage are sorted
+    """
+    selected = np.arange(len(percentages))
+
+    if limit is not None and limit < len(selected):
+        kth = np.partition(-percentages, limit - 1)[limit - 1]
+        selected = selected[-percentages <= kth]
+
+    keys = [key[selected] for key in reversed(order_keys)] + [-percentages[selected]]
+    order = selected[np.lexsort(keys)]
+    return order[:limit] if limit is not None else order
+
+
+def _with_match(job: Dict, percentage: float, skill_ids: frozenset, user_has: Dict[str, bool]) -> Dict:
+    """Plain dict copy of a job with match_percentage, matched_skills and missing_skills"""
+    matched = job.to_dict() if isinstance(job, JobRecord) else dict(job)
+
+    matched_skills, missing_skills = [], []
+    for skill in dict.fromkeys(job.get("skills") or []):
+        has = user_has.get(skill)
+        if has is None:
+            has = user_has[skill] = skill_registry.find(skill.lower()) in skill_ids
+        (matched_skills if has else missing_skills).append(skill)
+
+    matched["match_percentage"] = percentage
+    matched["matched_skills"] = matched_skills
+    matched["missing_skills"] = missing_skills
+    return matched
+
+
+def match_job_sets(
+    matrices: List[SkillMatrix],
+    user_skills: List[str],
+    min_match_percentage: float = 0,
+    limit: Optional[int] = None
+) -> List[Dict]:
+    """
+    Jobs of several result sets ranked by the share of their skills the user has
+
+    Ties keep set order, then list order. Returns plain dict copies with
+    match_percentage, matched_skills and missing_skills added; the given
+    job objects (often shared cache entries) are untouched. Jobs sharing
+    no skill with the user match 0%; they are only listed when
+    min_match_percentage allows it and the limit isn't already filled.
+    """
+    if limit is not None and limit <= 0:
+        return []
+
+    skill_ids = user_skill_ids(user_skills)
+    scored = [matrix.score(skill_ids, min_match_percentage) for matrix in matrices]
+
+    set_ids = np.concatenate([np.full(len(positions), i, dtype=np.int64) for i, (positions, _) in enumerate(scored)] + [_NO_POSITIONS])
+    positions = np.concatenate([positions for positions, _ in scored] + [_NO_POSITIONS])
+    percentages = np.concatenate([percentages for _, percentages in scored] + [np.zeros(0)])
+
+    order = _top(percentages, (set_ids, positions), limit)
+    ranked = [(int(set_ids[i]), int(positions[i]), float(percentages[i])) for i in order]
+
+    # Everything else matches 0%, in set and list order
+    if min_match_percentage <= 0 and (limit is None or len(ranked) < limit):
+        for i, (matrix, (scored_positions, _)) in enumerate(zip(matrices, scored)):
+            others = np.setdiff1d(np.arange(len(matrix)), scored_positions, assume_unique=True)
+            ranked.extend((i, int(position), 0.0) for position in others)
+        ranked = ranked[:limit] if limit is not None else ranked
+
+    user_has: Dict[str, bool] = {}
+    return [
+        _with_match(matrices[i].jobs[position], percentage, skill_ids, user_has)
+        for i, position, percentage in ranked
+    ]
+
+
+def match_jobs(
+    jobs: List[Dict],
+    user_skills: List[str],
+    min_match_percentage: float = 0,
+    limit: Optional[int] = None,
+    matrix: Optional[SkillMatrix] = None
+) -> List[Dict]:
+    """Jobs ranked by the share of their skills the user has (see match_job_sets)"""
+    return match_job_sets([matrix or SkillMatrix(jobs)], user_skills, min_match_percentage, limit)
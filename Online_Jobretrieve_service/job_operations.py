@@ -40,36 +40,30 @@ class JobOperations:
         }
 
         try:
-            # Fetch jobs from all sources
-            all_jobs = self.fetcher.fetch_all_sources(query, location)
-
-            # Filter to requested sources
-            filtered_jobs = {
-                source: jobs for source, jobs in all_jobs.items()
-                if source in sources
-            }
+            # Fetch jobs from the requested sources only
+            fetched_jobs = self.fetcher.fetch_all_sources(query, location, sources=sources)
 
             # Parse and store jobs
-            for source, jobs in filtered_jobs.items():
-                parsed_jobs = []
+            for source, jobs in fetched_jobs.items():
+                parsed_batch, errors = self.parser.parse_batch(jobs, source)
+                parsed_jobs = [parsed_job for parsed_job in parsed_batch if parsed_job is not None]
 
-                for job in jobs:
-                    try:
-                        parsed_job = self.parser.parse_job(job, source)
-                        parsed_jobs.append(parsed_job)
-                    except Exception as e:
-                        print(f"Error parsing job from {source}: {e}")
-                        continue
+                for error in errors.values():
+                    print(f"Error parsing job from {source}: {error}")
 
                 # Store in database
                 if parsed_jobs:
                     store_stats = self.storage.store_jobs_batch(parsed_jobs)
+                    stored = store_stats["inserted"] + store_stats["updated"]
                     stats["sources"][source] = {
                         "fetched": len(jobs),
-                        "stored": store_stats["inserted"]
+                        "stored": stored,
+                        "inserted": store_stats["inserted"],
+                        "updated": store_stats["updated"],
+                        "failed": store_stats["failed"]
                     }
                     stats["total_fetched"] += len(jobs)
-                    stats["total_stored"] += store_stats["inserted"]
+                    stats["total_stored"] += stored
 
                 # Log the fetch operation
                 self.storage.log_fetch(
@@ -2,93 +2,105 @@
 Job Data Parser - Normalizes job data from different APIs into a consistent format
 """
 
+import os
 from datetime import datetime
-from typing import Dict, List, Optional
-import re
-import uuid
+from typing import Dict, List, Optional, Tuple
+
+from job_sources import get_source
+from html_text import html_to_text, make_snippet
+from job_classifier import Classification, annual_salary_range
+from job_record import SALARY_PERIODS, JobRecord
+from parse_memo import ParseMemo, parse_memo
+from parse_pool import ParsePool, parse_each, parse_pool
+from skill_taxonomy import SkillTaxonomy, skill_taxonomy
+
+
+# Pay period spellings other than the SALARY_PERIODS keys themselves
+_SALARY_PERIOD_ALIASES = {
+    "yearly": "year", "annual": "year", "annually": "year", "monthly": "month",
+    "weekly": "week", "daily": "day", "hourly": "hour"
+}
 
 
 class JobParser:
     """Parses and normalizes job data from various sources"""
 
-    def __init__(self):
-        self.skill_keywords = self._load_skill_keywords()
+    def __init__(
+        self,
+        taxonomy: SkillTaxonomy = None,
+        memo: Optional[ParseMemo] = parse_memo,
+        pool: Optional[ParsePool] = parse_pool,
+        keep_html: bool = False
+    ):
+        self.taxonomy = taxonomy or skill_taxonomy
+        # Descriptions are stored as plain text; keep_html adds the original as description_html
+        self.keep_html = keep_html
+        # Unchanged payloads are parsed once; pass memo=None to always parse
+        self.memo = memo
+        # parse_batch() hands batches of at least pool_min_batch jobs to worker processes
+        self.pool = pool
+        self.pool_min_batch = int(os.getenv('PARSE_POOL_MIN_BATCH', 500))
+
+
+    @property
+    def skill_keywords(self) -> List[str]:
+        """Canonical skill names of the current taxonomy"""
+        return list(self.taxonomy.snapshot().skills)
 
 
-    def _load_skill_keywords(self) -> List[str]:
+    def extract_skills(self, text: str) -> List[str]:
         """
-        Load common tech skills for extraction
-        In production, load this from a database
+        Extract skills from job description
+        Uses whole-word matching of skill names and aliases from the skill
+        taxonomy (can be enhanced with NLP)
+        Skills are returned in order of first appearance
         """
-        return [
-            # Programming Languages
-            "python", "javascript", "java", "c++", "c#", "ruby", "php", "swift",
-            "kotlin", "go", "rust", "typescript", "scala", "r", "matlab",
-
-            # Web Frameworks
-            "react", "angular", "vue", "django", "flask", "fastapi", "nodejs",
-            "express", "nextjs", "nuxt", "spring", "laravel", "rails",
-
-            # Mobile
-            "react native", "flutter", "android", "ios", "xamarin",
+        snapshot = self.taxonomy.snapshot()
+        return [snapshot.skills[skill].display_name for skill in snapshot.matcher.extract(text)]
 
-            # Databases
-            "sql", "mysql", "postgresql", "mongodb", "redis", "cassandra",
-            "oracle", "dynamodb", "firebase", "supabase",
 
-            # Cloud & DevOps
-            "aws", "azure", "gcp", "docker", "kubernetes", "jenkins", "ci/cd",
-            "terraform", "ansible", "git", "github", "gitlab",
-
-            # Data Science & ML
-            "machine learning", "deep learning", "tensorflow", "pytorch",
-            "scikit-learn", "pandas", "numpy", "data analysis", "nlp",
-
-            # Other Skills
-            "rest api", "graphql", "microservices", "agile", "scrum",
-            "linux", "testing", "unit testing", "integration testing"
-        ]
-
-
-    def extract_skills(self, text: str) -> List[str]:
+    def classify(self, title: str, description: str) -> Tuple[Classification, List[str]]:
         """
-        Extract skills from job description
-        Uses keyword matching (can be enhanced with NLP)
+        Classify a job's title and description in one pass
+        Returns the classification and the skills as display names
         """
-        if not text:
-            return []
+        snapshot = self.taxonomy.snapshot()
+        classification = snapshot.classifier.classify(f"{title or ''} {description or ''}")
+        skills = [snapshot.skills[skill].display_name for skill in classification.skills]
 
-        text_lower = text.lower()
-        found_skills = []
+        return classification, skills
 
-        for skill in self.skill_keywords:
-            if skill in text_lower:
-                found_skills.append(skill.title())
 
-        return list(set(found_skills))  # Remove duplicates
+    def _with_html(self, parsed: Dict, description_html: str) -> Dict:
+        """Attach the original HTML description when the caller asked to keep it"""
+        if self.keep_html:
+            parsed["description_html"] = description_html
+        return parsed
 
 
     def parse_jsearch_job(self, job: Dict) -> Dict:
         """Parse job from JSearch API"""
-        description = job.get("job_description", "")
+        description_html = job.get("job_description") or ""
+        description = html_to_text(description_html)
         requirements = job.get("job_highlights", {}).get("Qualifications", [])
         benefits = job.get("job_highlights", {}).get("Benefits", [])
 
-        # Extract skills
-        skills = self.extract_skills(description)
+        classification, skills = self.classify(job.get("job_title"), description)
 
-        return {
+        return self._with_html({
             "external_job_id": job.get("job_id"),
             "title": job.get("job_title"),
             "company": job.get("employer_name"),
             "location": job.get("job_city") or job.get("job_country"),
             "remote": job.get("job_is_remote", False),
-            "job_type": self._normalize_job_type(job.get("job_employment_type")),
-            "experience_level": self._extract_experience_level(description),
+            "job_type": self._normalize_job_type(job.get("job_employment_type") or classification.job_type),
+            "experience_level": classification.experience_level,
             "salary_min": job.get("job_min_salary"),
             "salary_max": job.get("job_max_salary"),
             "salary_currency": job.get("job_salary_currency"),
+            "salary_period": self._normalize_salary_period(job.get("job_salary_period")),
             "description": description,
+            "description_snippet": make_snippet(description),
             "requirements": "\n".join(requirements) if requirements else None,
             "benefits": "\n".join(benefits) if benefits else None,
             "apply_url": job.get("job_apply_link"),
@@ -97,29 +109,32 @@ class JobParser:
             "posted_date": self._parse_date(job.get("job_posted_at_datetime_utc")),
             "source": "jsearch",
             "skills": skills
-        }
+        }, description_html)
 
 
     def parse_adzuna_job(self, job: Dict) -> Dict:
         """Parse job from Adzuna API"""
-        description = job.get("description", "")
+        description_html = job.get("description") or ""
+        description = html_to_text(description_html)
         title = job.get("title", "")
 
-        # Extract skills
-        skills = self.extract_skills(f"{title} {description}")
+        classification, skills = self.classify(title, description)
 
-        return {
+        return self._with_html({
             "external_job_id": str(job.get("id")),
             "title": title,
             "company": job.get("company", {}).get("display_name", "Unknown"),
             "location": job.get("location", {}).get("display_name"),
-            "remote": "remote" in title.lower() or "remote" in description.lower(),
-            "job_type": self._normalize_job_type(job.get("contract_type")),
-            "experience_level": self._extract_experience_level(description),
+            "remote": classification.remote,
+            "job_type": self._normalize_job_type(job.get("contract_type") or classification.job_type),
+            "experience_level": classification.experience_level,
             "salary_min": job.get("salary_min"),
             "salary_max": job.get("salary_max"),
             "salary_currency": "USD",
+            # Adzuna reports annual salaries
+            "salary_period": "year" if job.get("salary_min") or job.get("salary_max") else None,
             "description": description,
+            "description_snippet": make_snippet(description),
             "requirements": None,
             "benefits": None,
             "apply_url": job.get("redirect_url"),
@@ -128,28 +143,33 @@ class JobParser:
             "posted_date": self._parse_date(job.get("created")),
             "source": "adzuna",
             "skills": skills
-        }
+        }, description_html)
 
 
     def parse_remotive_job(self, job: Dict) -> Dict:
         """Parse job from Remotive API"""
-        description = job.get("description", "")
+        description_html = job.get("description") or ""
+        description = html_to_text(description_html)
         title = job.get("title", "")
 
-        skills = self.extract_skills(f"{title} {description}")
+        classification, skills = self.classify(title, description)
+        salary = annual_salary_range(classification.salary_mentions)
 
-        return {
+        return self._with_html({
             "external_job_id": str(job.get("id")),
             "title": title,
             "company": job.get("company_name"),
             "location": job.get("candidate_required_location", "Remote"),
             "remote": True,
-            "job_type": self._normalize_job_type(job.get("job_type")),
-            "experience_level": self._extract_experience_level(description),
-            "salary_min": None,
-            "salary_max": None,
-            "salary_currency": None,
+            "job_type": self._normalize_job_type(job.get("job_type") or classification.job_type),
+            "experience_level": classification.experience_level,
+            "salary_min": salary.low if salary else None,
+            "salary_max": salary.high if salary else None,
+            "salary_currency": salary.currency if salary else None,
+            # annual_salary_range only picks mentions that read as yearly
+            "salary_period": "year" if salary else None,
             "description": description,
+            "description_snippet": make_snippet(description),
             "requirements": None,
             "benefits": None,
             "apply_url": job.get("url"),
@@ -158,28 +178,35 @@ class JobParser:
             "posted_date": self._parse_date(job.get("publication_date")),
             "source": "remotive",
             "skills": skills
-        }
+        }, description_html)
 
 
     def parse_arbeitnow_job(self, job: Dict) -> Dict:
         """Parse job from Arbeitnow API"""
-        description = job.get("description", "")
+        description_html = job.get("description") or ""
+        description = html_to_text(description_html)
         title = job.get("title", "")
 
-        skills = self.extract_skills(f"{title} {description}")
+        classification, skills = self.classify(title, description)
+        salary = annual_salary_range(classification.salary_mentions)
 
-        return {
+        return self._with_html({
             "external_job_id": job.get("slug"),
             "title": title,
             "company": job.get("company_name"),
             "location": job.get("location", "Remote"),
             "remote": job.get("remote", False),
-            "job_type": "full-time",
-            "experience_level": self._extract_experience_level(description),
-            "salary_min": None,
-            "salary_max": None,
-            "salary_currency": None,
+            # job_types is Arbeitnow's structured field (e.g. ["Full time", "Berufserfahren"]);
+            # the description is not used, as it mentions contracts and interns in passing
+            "job_type": self._normalize_job_type(" ".join(job.get("job_types") or [])),
+            "experience_level": classification.experience_level,
+            "salary_min": salary.low if salary else None,
+            "salary_max": salary.high if salary else None,
+            "salary_currency": salary.currency if salary else None,
+            # annual_salary_range only picks mentions that read as yearly
+            "salary_period": "year" if salary else None,
             "description": description,
+            "description_snippet": make_snippet(description),
             "requirements": None,
             "benefits": None,
             "apply_url": job.get("url"),
@@ -188,32 +215,37 @@ class JobParser:
             "posted_date": self._parse_date(job.get("created_at")),
             "source": "arbeitnow",
             "skills": skills
-        }
+        }, description_html)
 
 
     def parse_themuse_job(self, job: Dict) -> Dict:
         """Parse job from The Muse API"""
-        description = job.get("contents", "")
+        description_html = job.get("contents") or ""
+        description = html_to_text(description_html)
         title = job.get("name", "")
         company = job.get("company", {})
 
-        skills = self.extract_skills(f"{title} {description}")
+        classification, skills = self.classify(title, description)
+        salary = annual_salary_range(classification.salary_mentions)
 
         locations = job.get("locations", [])
         location = locations[0].get("name") if locations else "Unknown"
 
-        return {
+        return self._with_html({
             "external_job_id": str(job.get("id")),
             "title": title,
             "company": company.get("name", "Unknown"),
             "location": location,
             "remote": any("remote" in loc.get("name", "").lower() for loc in locations),
-            "job_type": self._normalize_job_type(job.get("type")),
-            "experience_level": self._extract_experience_level(description),
-            "salary_min": None,
-            "salary_max": None,
-            "salary_currency": None,
+            "job_type": self._normalize_job_type(job.get("type") or classification.job_type),
+            "experience_level": classification.experience_level,
+            "salary_min": salary.low if salary else None,
+            "salary_max": salary.high if salary else None,
+            "salary_currency": salary.currency if salary else None,
+            # annual_salary_range only picks mentions that read as yearly
+            "salary_period": "year" if salary else None,
             "description": description,
+            "description_snippet": make_snippet(description),
             "requirements": None,
             "benefits": None,
             "apply_url": job.get("refs", {}).get("landing_page"),
@@ -222,26 +254,100 @@ class JobParser:
             "posted_date": self._parse_date(job.get("publication_date")),
             "source": "themuse",
             "skills": skills
-        }
+        }, description_html)
 
 
-    def parse_job(self, job: Dict, source: str) -> Dict:
+    def parse_job(self, job: Dict, source: str) -> JobRecord:
         """
-        Parse job based on source
+        Parse job based on source, using the source's registered adapter
+        Payloads seen before are served from the parse memo
         """
-        parsers = {
-            "jsearch": self.parse_jsearch_job,
-            "adzuna": self.parse_adzuna_job,
-            "remotive": self.parse_remotive_job,
-            "arbeitnow": self.parse_arbeitnow_job,
-            "themuse": self.parse_themuse_job
-        }
-
-        parser = parsers.get(source)
-        if not parser:
+        adapter = get_source(source)
+        if not adapter:
             raise ValueError(f"Unknown source: {source}")
 
-        return parser(job)
+        if self.memo is None:
+            return JobRecord(adapter.parse(self, job))
+
+        return self.memo.get_or_parse(
+            source,
+            adapter.external_id(job),
+            job,
+            lambda raw: JobRecord(adapter.parse(self, raw)),
+            version=(id(self.taxonomy), self.taxonomy.snapshot().version, self.keep_html)
+        )
+
+
+    def parse_batch(self, jobs: List[Dict], source: str) -> Tuple[List[Optional[JobRecord]], Dict[int, str]]:
+        """
+        Parse many jobs of one source
+
+        Jobs are looked up in the parse memo first. If enough remain, they are
+        split across the process pool; small batches are parsed in-process,
+        where pickling would cost more than it saves.
+
+        Returns:
+            Tuple of (parsed jobs aligned with the input, None where parsing
+            failed, and error messages by input index)
+        """
+        adapter = get_source(source)
+        if not adapter:
+            raise ValueError(f"Unknown source: {source}")
+
+        snapshot = self.taxonomy.snapshot()
+        version = (id(self.taxonomy), snapshot.version, self.keep_html)
+
+        results: List[Optional[Dict]] = [None] * len(jobs)
+        errors: Dict[int, str] = {}
+        pending = []
+
+        for index, job in enumerate(jobs):
+            try:
+                key = self.memo.key(source, adapter.external_id(job), job, version) if self.memo else None
+            except Exception as e:
+                # Malformed payload (e.g. None); parsing it would fail too
+                errors[index] = f"{type(e).__name__}: {e}"
+                continue
+
+            cached = self.memo.get(key) if key else None
+
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append((index, key))
+
+        outcomes = self._parse_uncached(adapter, [jobs[index] for index, _ in pending], snapshot)
+
+        for (index, key), (parsed, error) in zip(pending, outcomes):
+            if error:
+                errors[index] = error
+                continue
+
+            if key:
+                self.memo.put(key, parsed)
+            results[index] = parsed
+
+        return results, errors
+
+
+    def _parse_uncached(self, adapter, jobs: List[Dict], snapshot) -> List[Tuple[Optional[Dict], Optional[str]]]:
+        if self.pool and len(jobs) >= self.pool_min_batch:
+            try:
+                return self.pool.parse(adapter.name, jobs, snapshot, keep_html=self.keep_html)
+            except Exception as e:
+                print(f"[WARN] Parse pool unavailable, parsing in-process: {type(e).__name__} {e}")
+
+        return parse_each(lambda job: JobRecord(adapter.parse(self, job)), jobs)
+
+
+    @staticmethod
+    def _normalize_salary_period(period: Optional[str]) -> Optional[str]:
+        """Normalize a pay period (JSearch sends YEAR, MONTH, HOUR, ...) to a SALARY_PERIODS key"""
+        if not period:
+            return None
+
+        period = period.strip().lower()
+        return _SALARY_PERIOD_ALIASES.get(period, period if period in SALARY_PERIODS else None)
 
 
     def _normalize_job_type(self, job_type: Optional[str]) -> str:
@@ -265,36 +371,6 @@ class JobParser:
             return "full-time"
 
 
-    def _extract_experience_level(self, text: str) -> str:
-        """
-        Extract experience level from job description
-        Returns: entry, mid, senior
-        """
-        if not text:
-            return "mid"
-
-        text_lower = text.lower()
-
-        # Entry level keywords
-        entry_keywords = [
-            "entry level", "junior", "graduate", "fresher",
-            "0-2 years", "0-1 year", "internship"
-        ]
-
-        # Senior level keywords
-        senior_keywords = [
-            "senior", "lead", "principal", "architect",
-            "5+ years", "7+ years", "10+ years", "expert"
-        ]
-
-        if any(keyword in text_lower for keyword in entry_keywords):
-            return "entry"
-        elif any(keyword in text_lower for keyword in senior_keywords):
-            return "senior"
-        else:
-            return "mid"
-
-
     def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
         """Parse date string to datetime object"""
         if not date_str:
@@ -0,0 +1,261 @@
+"""
+Job Record - Compact container for a parsed job
+Parsed jobs are held by the thousands in the realtime cache, the parse memo
+and analytics working sets. A slotted record with interned low-cardinality
+strings and skills stored as small integer ids takes a fraction of the
+memory of a 20-key dict, while still behaving like one for existing code
+"""
+
+import sys
+import threading
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Keys produced by JobParser, in output order
+JOB_FIELDS = (
+    "external_job_id", "title", "company", "location", "remote", "job_type",
+    "experience_level", "salary_min", "salary_max", "salary_currency",
+    "salary_period", "description", "description_snippet", "requirements", "benefits",
+    "apply_url", "company_logo", "category", "posted_date", "source", "skills"
+)
+
+# Fields with few distinct values, shared between records via sys.intern
+_INTERNED_FIELDS = frozenset({"job_type", "experience_level", "salary_currency", "salary_period", "category", "source"})
+
+_SLOT_FIELDS = frozenset(field for field in JOB_FIELDS if field != "skills")
+
+# Marks a slot that was never assigned
+_UNSET = object()
+
+# Normalized filter keys, derived from the fields whenever they are set
+_KEY_SLOTS = (
+    "company_key", "location_key", "job_type_key", "experience_level_key",
+    "skill_keys", "annual_salary_min", "annual_salary_max"
+)
+
+# Pay periods per year, by the salary_period values the parser records
+SALARY_PERIODS = {"year": 1, "month": 12, "week": 52, "day": 260, "hour": 2080}
+
+
+def annual_salary(amount: Any, period: Optional[str] = None) -> Optional[float]:
+    """
+    Yearly equivalent of a salary figure paid per period
+    Without a known period the figure is returned as posted
+    """
+    if isinstance(amount, str):
+        try:
+            amount = float(amount)
+        except ValueError:
+            return None
+
+    if not isinstance(amount, (int, float)) or isinstance(amount, bool) or amount <= 0:
+        return None
+
+    return float(amount * SALARY_PERIODS.get(period, 1))
+
+
+def _text_key(value: Any) -> str:
+    return value.lower() if isinstance(value, str) else ""
+
+
+class SkillRegistry:
+    """
+    Append-only mapping between skill names and small integer ids
+    Ids are only meaningful inside one process; records pickle skill names
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+
+
+    def id_of(self, name: str) -> int:
+        skill_id = self._ids.get(name)
+        if skill_id is None:
+            with self._lock:
+                skill_id = self._ids.get(name)
+                if skill_id is None:
+                    skill_id = len(self._names)
+                    self._names.append(name)
+                    self._ids[name] = skill_id
+        return skill_id
+
+
+    def ids(self, names: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self.id_of(name) for name in names)
+
+
+    def find(self, name: str) -> Optional[int]:
+        """Id of an already registered name, without registering it"""
+        return self._ids.get(name)
+
+
+    def names(self, ids: Iterable[int]) -> List[str]:
+        names = self._names
+        return [names[skill_id] for skill_id in ids]
+
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+# Shared registry for the process
+skill_registry = SkillRegistry()
+
+
+class JobRecord(MutableMapping):
+    """
+    A parsed job with a dict-like interface
+
+    The fields in JOB_FIELDS live in slots; any other key (e.g.
+    external_platform, match_percentage) goes into a small overflow dict.
+    record["skills"] returns a new list of names built from skill_ids.
+
+    Filter keys are kept next to the fields they come from and are not part
+    of the mapping: lowercase company_key, location_key, job_type_key and
+    experience_level_key, skill_keys (frozenset of registry ids of the
+    lowercase skill names) and annual_salary_min/max (salary_min/max per
+    year when salary_period is known, as posted otherwise).
+    """
+
+    __slots__ = tuple(sorted(_SLOT_FIELDS)) + ("skill_ids", "_extra") + _KEY_SLOTS
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, **fields):
+        self._extra: Optional[Dict[str, Any]] = None
+        self._reset_keys()
+        if data:
+            self.update(data)
+        if fields:
+            self.update(fields)
+
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "skills":
+            try:
+                skill_ids = self.skill_ids
+            except AttributeError:
+                raise KeyError(key) from None
+            return skill_registry.names(skill_ids) if skill_ids is not None else None
+
+        if key in _SLOT_FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+
+    def _reset_keys(self) -> None:
+        self.company_key = self.location_key = ""
+        self.job_type_key = self.experience_level_key = ""
+        self.skill_keys = frozenset()
+        self.annual_salary_min = self.annual_salary_max = None
+
+
+    def _update_key(self, key: str, value: Any) -> None:
+        """Recompute the filter key derived from one field"""
+        if key == "skills":
+            self.skill_keys = frozenset(skill_registry.ids(name.lower() for name in value or ()))
+        elif key == "company":
+            self.company_key = _text_key(value)
+        elif key == "location":
+            self.location_key = _text_key(value)
+        elif key == "job_type":
+            self.job_type_key = sys.intern(_text_key(value))
+        elif key == "experience_level":
+            self.experience_level_key = sys.intern(_text_key(value))
+        elif key in ("salary_min", "salary_max", "salary_period"):
+            period = getattr(self, "salary_period", None)
+            self.annual_salary_min = annual_salary(getattr(self, "salary_min", None), period)
+            self.annual_salary_max = annual_salary(getattr(self, "salary_max", None), period)
+
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == "skills":
+            self.skill_ids = skill_registry.ids(value) if value is not None else None
+            self._update_key(key, value)
+        elif key in _SLOT_FIELDS:
+            if key in _INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+            self._update_key(key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+
+    def __delitem__(self, key: str) -> None:
+        attribute = "skill_ids" if key == "skills" else key
+
+        if attribute == "skill_ids" or key in _SLOT_FIELDS:
+            try:
+                delattr(self, attribute)
+            except AttributeError:
+                raise KeyError(key) from None
+            self._update_key(key, None)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+
+    def __contains__(self, key: object) -> bool:
+        if key == "skills":
+            return hasattr(self, "skill_ids")
+        if key in _SLOT_FIELDS:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+
+    def __iter__(self) -> Iterator[str]:
+        for field in JOB_FIELDS:
+            if field in self:
+                yield field
+        if self._extra:
+            yield from list(self._extra)
+
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+    def __repr__(self) -> str:
+        return f"JobRecord({self.to_dict()!r})"
+
+
+    def copy(self) -> "JobRecord":
+        """Independent copy (field values themselves are shared)"""
+        copied = JobRecord.__new__(JobRecord)
+        for attribute in JobRecord.__slots__:
+            value = getattr(self, attribute, _UNSET)
+            if value is not _UNSET:
+                setattr(copied, attribute, value)
+        copied._extra = dict(self._extra) if self._extra else None
+        return copied
+
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with the same keys, order and values as the parser's old output"""
+        return {key: self[key] for key in self}
+
+
+    # Skill ids are local to this process, so pickles carry names instead
+    def __getstate__(self) -> Dict[str, Any]:
+        return self.to_dict()
+
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._extra = None
+        self._reset_keys()
+        self.update(state)
+
+
+def as_dicts(jobs: Iterable[Dict]) -> List[Dict]:
+    """Jobs as plain dicts (JobRecords converted), serializable by any JSON encoder"""
+    return [job.to_dict() if isinstance(job, JobRecord) else job for job in jobs]
@@ -7,6 +7,7 @@ import os
 import sys
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List, Tuple
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 import logging
@@ -22,7 +23,8 @@ logger = logging.getLogger(__name__)
 current_path = Path(__file__).parent
 sys.path.insert(0, str(current_path))
 
-from job_fetcher import JobFetcher
+from job_fetcher import JobFetcher, SOURCE_OK, SOURCE_SKIPPED
+from job_sources import SOURCE_REGISTRY
 from job_parser import JobParser
 from job_storage import JobStorage
 
@@ -40,6 +42,37 @@ class JobScheduler:
         self.fetch_interval_hours = int(os.getenv('JOB_FETCH_INTERVAL_HOURS', 6))
         self.cleanup_days = int(os.getenv('JOB_CLEANUP_DAYS', 30))
 
+        # Latency budget for one cycle's upstream requests (rate limits spread them out)
+        self.fetch_deadline_ms = int(os.getenv('JOB_SCHEDULER_FETCH_TIMEOUT_SECONDS', 120)) * 1000
+
+
+    def _plan_cycle(self, queries: List[Dict]) -> Tuple[Dict[Tuple, Tuple[str, str, str]], List[Tuple[Dict, List[Tuple[str, Tuple]]]]]:
+        """
+        Work out which upstream requests a fetch cycle needs
+
+        Boards that ignore the query (Remotive, The Muse) or filter it locally
+        (Arbeitnow) map every query to the same request, so each distinct
+        request is made once per cycle instead of once per query.
+
+        Returns:
+            Tuple of (unique requests keyed by JobSource.upstream_key, and for
+            each query config the (source, request key) pairs it draws from)
+        """
+        requests_by_key = {}
+        query_plan = []
+
+        for query_config in queries:
+            source_keys = []
+
+            for source in SOURCE_REGISTRY.values():
+                key = source.upstream_key(query_config["query"], query_config["location"])
+                requests_by_key.setdefault(key, (source.name, query_config["query"], query_config["location"]))
+                source_keys.append((source.name, key))
+
+            query_plan.append((query_config, source_keys))
+
+        return requests_by_key, query_plan
+
 
     def fetch_job_task(self):
         """
@@ -58,49 +91,88 @@ class JobScheduler:
                 {"query": "backend developer", "location": "Remote"},
             ]
 
-            total_fetched = 0
-            total_stored = 0
+            requests_by_key, query_plan = self._plan_cycle(queries)
+            logger.info(
+                f"Planned {len(requests_by_key)} upstream requests for "
+                f"{len(queries)} queries x {len(SOURCE_REGISTRY)} sources"
+            )
 
-            for query_config in queries:
-                logger.info(f"Fetching: {query_config['query']} in {query_config['location']}")
+            # Each distinct upstream request runs once
+            raw_by_key, status_by_key = self.fetcher.fetch_upstream_requests(
+                requests_by_key, deadline_ms=self.fetch_deadline_ms
+            )
 
-                # Fetch from all sources
-                all_jobs = self.fetcher.fetch_all_sources(
-                    query_config["query"],
-                    query_config["location"]
-                )
+            skipped = sorted({key[0] for key, status in status_by_key.items() if status == SOURCE_SKIPPED})
+            if skipped:
+                logger.info(f"  Skipped (no credentials or quota used up): {', '.join(skipped)}")
+
+            # Parse each download once, keeping the raw job for local query filtering
+            # (postings unchanged since an earlier cycle come from the parse memo)
+            memo_before = self.parser.memo.stats() if self.parser.memo else None
+            parsed_by_key = {}
+            for key, jobs in raw_by_key.items():
+                source = requests_by_key[key][0]
+                parsed_jobs, errors = self.parser.parse_batch(jobs, source)
+
+                for error in errors.values():
+                    logger.error(f"Error parsing job from {source}: {error}")
+
+                parsed_by_key[key] = [
+                    (job, parsed_job) for job, parsed_job in zip(jobs, parsed_jobs) if parsed_job is not None
+                ]
+
+            if memo_before:
+                memo_after = self.parser.memo.stats()
+                reused = memo_after["hits"] - memo_before["hits"]
+                parsed = memo_after["misses"] - memo_before["misses"]
+                logger.info(f"  Parsed {parsed} new or changed postings, reused {reused} unchanged")
+
+            # Apply query-specific filtering locally and collect each posting once
+            jobs_to_store = {}
+            for query_config, source_keys in query_plan:
+                matched = 0
+
+                for source_name, key in source_keys:
+                    source = SOURCE_REGISTRY[source_name]
+
+                    for job, parsed_job in parsed_by_key[key]:
+                        if not source.matches_query(job, query_config["query"]):
+                            continue
 
-                # Parse and store jobs from each source
-                for source, jobs in all_jobs.items():
-                    if not jobs:
-                        continue
+                        matched += 1
+                        jobs_to_store.setdefault(source_name, {}).setdefault(
+                            parsed_job["external_job_id"], parsed_job
+                        )
 
-                    parsed_jobs = []
+                logger.info(f"  {query_config['query']} in {query_config['location']}: {matched} jobs")
 
-                    for job in jobs:
-                        try:
-                            parsed_job = self.parser.parse_job(job, source)
-                            parsed_jobs.append(parsed_job)
-                        except Exception as e:
-                            logger.error(f"Error parsing job from {source}: {e}")
-                            continue
+            total_fetched = sum(len(jobs) for jobs in raw_by_key.values())
+            total_stored = 0
 
-                    # Store in database
-                    if parsed_jobs:
-                        stats = self.storage.store_jobs_batch(parsed_jobs)
-                        total_fetched += len(jobs)
-                        total_stored += stats["inserted"]
+            # Store in database, one batch per source
+            for source, jobs_by_id in jobs_to_store.items():
+                stats = self.storage.store_jobs_batch(list(jobs_by_id.values()))
+                stored = stats["inserted"] + stats["updated"]
+                total_stored += stored
 
-                        logger.info(
-                            f"  {source}: Fetched {len(jobs)}, Stored {stats['inserted']}"
-                        )
+                logger.info(
+                    f"  {source}: Stored {stored} of {len(jobs_by_id)} unique jobs "
+                    f"({stats['inserted']} new, {stats['updated']} updated, {stats['failed']} failed)"
+                )
 
-                        # Log the fetch operation
-                        self.storage.log_fetch(
-                            source=f"{source}_{query_config['query']}",
-                            jobs_fetched=len(jobs),
-                            status="success"
-                        )
+            # Log each upstream request
+            for key, (source, query, location) in requests_by_key.items():
+                status = status_by_key.get(key, SOURCE_SKIPPED)
+                if status == SOURCE_SKIPPED:
+                    continue
+
+                log_name = source if key[1] is None else f"{source}_{query}"
+                self.storage.log_fetch(
+                    source=log_name,
+                    jobs_fetched=len(raw_by_key[key]),
+                    status="success" if status == SOURCE_OK else "failed",
+                    error_message=None if status == SOURCE_OK else status
+                )
 
             logger.info(
                 f"[OK] Job fetch completed. "
@@ -0,0 +1,150 @@
+"""
+Job Source Registry - One adapter per upstream job board
+Adapters declare what a board supports and how to fetch and parse it, so a
+new board is added by registering an adapter here (or from any module)
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+
+class JobSource:
+    """
+    Base adapter for an upstream job board
+
+    Capabilities:
+        query_aware: Results depend on the search query
+        location_aware: Results depend on the search location
+        paginated: The board is fetched page by page
+        needs_key: The board needs API credentials
+        filters_locally: The board is downloaded whole and the query is
+                         applied on our side (see matches_query)
+        id_field: Field of a raw job holding the board's posting id
+    """
+
+    name = ""
+    query_aware = True
+    location_aware = False
+    paginated = False
+    needs_key = False
+    filters_locally = False
+    id_field = "id"
+
+    def is_configured(self, fetcher) -> bool:
+        """Check whether the fetcher has what this board needs (e.g. API keys)"""
+        return True
+
+    def fetch(self, fetcher, query: str, location: str, deadline: Optional[float] = None) -> List[Dict]:
+        """Fetch raw jobs for a search; raises on failure"""
+        raise NotImplementedError
+
+    def fetch_raw(self, fetcher, query: str, location: str, deadline: Optional[float] = None) -> List[Dict]:
+        """Fetch without local query filtering; same as fetch() unless filters_locally"""
+        return self.fetch(fetcher, query, location, deadline)
+
+    def matches_query(self, job: Dict, query: str) -> bool:
+        """Local query filter applied to fetch_raw() results"""
+        return True
+
+    def upstream_key(self, query: str, location: str) -> Tuple:
+        """
+        Identifies the upstream request fetch_raw() makes for a search
+        Searches with equal keys can share one download
+        """
+        query_key = query.lower().strip() if self.query_aware and not self.filters_locally else None
+        location_key = location.lower().strip() if self.location_aware else None
+        return (self.name, query_key, location_key)
+
+    def external_id(self, job: Dict) -> Optional[str]:
+        """The board's id for a raw job"""
+        value = job.get(self.id_field)
+        return str(value) if value is not None else None
+
+
+    def parse(self, parser, job: Dict) -> Dict:
+        """Normalize one raw job; defaults to JobParser.parse_<name>_job"""
+        return getattr(parser, f"parse_{self.name}_job")(job)
+
+
+# Registered sources, in the order results are reported
+SOURCE_REGISTRY: Dict[str, JobSource] = {}
+
+
+def register_source(source: JobSource) -> JobSource:
+    """Add (or replace) a job board adapter"""
+    SOURCE_REGISTRY[source.name] = source
+    return source
+
+
+def get_source(name: str) -> Optional[JobSource]:
+    """Look up a registered adapter by name"""
+    return SOURCE_REGISTRY.get(name)
+
+
+class JSearchSource(JobSource):
+    name = "jsearch"
+    id_field = "job_id"
+    location_aware = True
+    paginated = True
+    needs_key = True
+
+    def is_configured(self, fetcher) -> bool:
+        return bool(fetcher.jsearch_api_key)
+
+    def fetch(self, fetcher, query, location, deadline=None):
+        return fetcher.fetch_jsearch_jobs(query, location, num_pages=1, deadline=deadline, raise_errors=True)
+
+
+class AdzunaSource(JobSource):
+    name = "adzuna"
+    location_aware = True
+    paginated = True
+    needs_key = True
+
+    def is_configured(self, fetcher) -> bool:
+        return bool(fetcher.adzuna_app_id and fetcher.adzuna_app_key)
+
+    def fetch(self, fetcher, query, location, deadline=None):
+        return fetcher.fetch_adzuna_jobs(query, location, max_pages=1, deadline=deadline, raise_errors=True)
+
+
+class RemotiveSource(JobSource):
+    name = "remotive"
+    query_aware = False
+
+    def fetch(self, fetcher, query, location, deadline=None):
+        return fetcher.fetch_remotive_jobs(deadline=deadline, raise_errors=True)
+
+
+class ArbeitnowSource(JobSource):
+    name = "arbeitnow"
+    id_field = "slug"
+    filters_locally = True
+
+    def fetch(self, fetcher, query, location, deadline=None):
+        return fetcher.fetch_arbeitnow_jobs(query, deadline=deadline, raise_errors=True)
+
+    def fetch_raw(self, fetcher, query, location, deadline=None):
+        return fetcher.fetch_arbeitnow_jobs("", deadline=deadline, raise_errors=True)
+
+    def matches_query(self, job, query):
+        # Same rule fetch_arbeitnow_jobs applies
+        query_lower = query.lower()
+        return (
+            query_lower in job.get("title", "").lower() or
+            query_lower in job.get("description", "").lower()
+        )
+
+
+class TheMuseSource(JobSource):
+    name = "themuse"
+    query_aware = False
+
+    def fetch(self, fetcher, query, location, deadline=None):
+        return fetcher.fetch_themuse_jobs(category="Software Engineering", deadline=deadline, raise_errors=True)
+
+
+register_source(JSearchSource())
+register_source(AdzunaSource())
+register_source(RemotiveSource())
+register_source(ArbeitnowSource())
+register_source(TheMuseSource())
@@ -4,10 +4,50 @@ Job Storage Service - Stores parsed jobs in Supabase database
 
 import os
 import sys
-from datetime import datetime
-from typing import List, Dict, Optional
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
 from supabase import create_client, Client
 
+from job_filters import compile_filters
+from job_matcher import match_jobs, user_skill_names
+
+
+# retrieveJobs columns a parsed job may fill; other keys (description_snippet,
+# description_html, external_platform, ...) are response-only and not stored
+JOB_COLUMNS = (
+    "external_job_id", "title", "company", "location", "remote", "job_type",
+    "experience_level", "salary_min", "salary_max", "salary_currency",
+    "salary_period", "description", "requirements", "benefits", "apply_url", "company_logo",
+    "category", "posted_date", "expiry_date", "source", "is_active"
+)
+
+
+# retrieveJobs rows with their skill names embedded, fetched in one request
+JOB_WITH_SKILLS_SELECT = "*, retrieveJob_skills(skill_name)"
+
+# Ids per in.() filter; keeps request URLs well under PostgREST/proxy limits
+ID_CHUNK_SIZE = 200
+
+# Rows per select page; PostgREST caps responses at its max-rows setting (1000 on Supabase)
+PAGE_SIZE = 1000
+
+# Rows per multi-row upsert in store_jobs_batch
+UPSERT_CHUNK_SIZE = int(os.getenv('JOB_UPSERT_CHUNK_SIZE', 500))
+
+
+def to_job_row(job: Dict) -> Dict:
+    """
+    retrieveJobs row for a parsed job, keeping known columns only
+    Dates (posted_date from the parser is a datetime) become ISO strings
+    """
+    row = {column: job[column] for column in JOB_COLUMNS if column in job}
+
+    for column, value in row.items():
+        if isinstance(value, (datetime, date)):
+            row[column] = value.isoformat()
+
+    return row
+
 
 class JobStorage:
     """Handles job storage in Supabase database"""
@@ -22,6 +62,9 @@ class JobStorage:
 
         self.client: Client = create_client(self.supabase_url, self.supabase_key)
 
+        # Skill names known to be in the skills table, so each is upserted once per process
+        self._known_skills = set()
+
 
     def store_job(self, job_data: Dict) -> Optional[str]:
         """
@@ -30,7 +73,8 @@ class JobStorage:
         """
         try:
             # Separate skills from job data
-            skills = job_data.pop("skills", [])
+            skills = job_data.get("skills") or []
+            job_data = to_job_row(job_data)
 
             # Check if job already exists
             existing = self.client.table("retrieveJobs").select("id").eq(
@@ -64,60 +108,157 @@ class JobStorage:
 
     def _store_job_skills(self, job_id: str, skills: List[str]) -> None:
         """Store skills for a job"""
-        try:
-            # First, add skills to skills master table if they don't exist
-            for skill in skills:
-                try:
-                    self.client.table("skills").insert({
-                        "name": skill,
-                        "category": "technical"
-                    }).execute()
-                except:
-                    # Skill already exists, skip
-                    pass
-
-            # Delete existing retrieveJob_skills for this job
-            self.client.table("retrieveJob_skills").delete().eq("job_id", job_id).execute()
-
-            # Insert new retrieveJob_skills
-            skill_records = [
-                {
-                    "job_id": job_id,
-                    "skill_name": skill,
-                    "is_required": True
-                }
-                for skill in skills
-            ]
+        self._store_skills_batch({job_id: skills})
 
-            if skill_records:
-                self.client.table("retrieveJob_skills").insert(skill_records).execute()
+
+    def _store_skills_batch(self, skills_by_job: Dict[str, List[str]]) -> None:
+        """
+        Store the skills of several jobs, replacing their previous skills
+
+        New names go to the skills master table in one upsert; names this
+        process has already written are skipped. The jobs' stored links are
+        read back and only the difference is written: one insert for added
+        links and one delete for removed ones, so an unchanged job costs
+        nothing beyond the read.
+        """
+        try:
+            skills_by_job = {job_id: list(dict.fromkeys(skills or [])) for job_id, skills in skills_by_job.items()}
+            self._store_skill_names(skill for skills in skills_by_job.values() for skill in skills)
+
+            stored: Dict[str, Dict[str, str]] = {job_id: {} for job_id in skills_by_job}
+            for row in self._job_skill_rows(list(skills_by_job), "id, job_id, skill_name"):
+                stored[row["job_id"]][row["skill_name"]] = row["id"]
+
+            added, removed = [], []
+            for job_id, skills in skills_by_job.items():
+                links = stored[job_id]
+                added.extend(
+                    {"job_id": job_id, "skill_name": skill, "is_required": True}
+                    for skill in skills if skill not in links
+                )
+                removed.extend(link_id for skill, link_id in links.items() if skill not in skills)
+
+            for chunk in self._chunks(removed):
+                self.client.table("retrieveJob_skills").delete().in_("id", chunk).execute()
+
+            if added:
+                self.client.table("retrieveJob_skills").upsert(
+                    added,
+                    on_conflict="job_id,skill_name",
+                    ignore_duplicates=True
+                ).execute()
 
         except Exception as e:
             print(f"Warning: Error storing skills: {e}")
 
 
+    def _store_skill_names(self, skills: Iterable[str]) -> None:
+        """Add skills missing from the skills master table"""
+        new_skills = [skill for skill in dict.fromkeys(skills) if skill not in self._known_skills]
+        if not new_skills:
+            return
+
+        self.client.table("skills").upsert(
+            [{"name": skill, "category": "technical"} for skill in new_skills],
+            on_conflict="name",
+            ignore_duplicates=True
+        ).execute()
+        self._known_skills.update(new_skills)
+
+
     def store_jobs_batch(self, jobs: List[Dict]) -> Dict:
         """
         Store multiple jobs in batch
         Returns statistics about the operation
+
+        Jobs are written with one multi-row upsert on external_job_id per
+        chunk, after one select telling which of them already exist, so a
+        chunk costs two round trips plus its skill writes. A chunk the
+        database rejects is retried job by job to isolate the bad rows.
+        Repeated external ids in the batch are stored once (last wins) and
+        counted as duplicates.
         """
         stats = {
             "total": len(jobs),
             "inserted": 0,
             "updated": 0,
-            "failed": 0
+            "failed": 0,
+            "duplicates": 0
         }
 
+        jobs_by_external_id = {}
         for job in jobs:
-            job_id = self.store_job(job)
-            if job_id:
-                stats["inserted"] += 1
-            else:
+            external_id = job.get("external_job_id")
+            if not external_id:
                 stats["failed"] += 1
+                continue
+
+            if external_id in jobs_by_external_id:
+                stats["duplicates"] += 1
+            jobs_by_external_id[external_id] = job
+
+        unique_jobs = list(jobs_by_external_id.values())
+        for i in range(0, len(unique_jobs), UPSERT_CHUNK_SIZE):
+            self._upsert_jobs_chunk(unique_jobs[i:i + UPSERT_CHUNK_SIZE], stats)
 
         return stats
 
 
+    def _upsert_jobs_chunk(self, jobs: List[Dict], stats: Dict) -> None:
+        """Upsert one chunk of jobs with distinct external ids, updating stats"""
+        external_ids = [job["external_job_id"] for job in jobs]
+
+        try:
+            existing = self.client.table("retrieveJobs").select("external_job_id").in_(
+                "external_job_id", external_ids
+            ).execute()
+            existing_ids = {row["external_job_id"] for row in existing.data}
+        except Exception as e:
+            print(f"[Error] checking existing jobs: {e}")
+            stats["failed"] += len(jobs)
+            return
+
+        now = datetime.now().isoformat()
+        rows = [{**to_job_row(job), "updated_at": now} for job in jobs]
+
+        try:
+            # Parsed jobs all carry the same fields, so the rows share one column
+            # list; columns none of them set (e.g. is_active) keep their defaults
+            result = self.client.table("retrieveJobs").upsert(
+                rows,
+                on_conflict="external_job_id"
+            ).execute()
+        except Exception as e:
+            print(f"[Error] upserting {len(jobs)} jobs, retrying one by one: {e}")
+            for job in jobs:
+                if self.store_job(job):
+                    stats["updated" if job["external_job_id"] in existing_ids else "inserted"] += 1
+                else:
+                    stats["failed"] += 1
+            return
+
+        ids_by_external_id = {row["external_job_id"]: row["id"] for row in result.data}
+        skills_by_job = {}
+
+        for job in jobs:
+            external_id = job["external_job_id"]
+            job_id = ids_by_external_id.get(external_id)
+
+            if job_id is None:
+                stats["failed"] += 1
+                continue
+
+            stats["updated" if external_id in existing_ids else "inserted"] += 1
+
+            if job.get("skills"):
+                skills_by_job[job_id] = job["skills"]
+
+        if skills_by_job:
+            self._store_skills_batch(skills_by_job)
+
+        print(f"[Upserted] {len(ids_by_external_id)} jobs ({len(existing_ids)} already stored)")
+
+
     def log_fetch(
         self,
         source: str,
@@ -146,35 +287,20 @@ class JobStorage:
     ) -> List[Dict]:
         """
         Retrieve jobs from database with filters
+        Accepts the same filters as the job routes (see job_filters.JobFilter)
         """
         try:
-            query = self.client.table("retrieveJobs").select("*")
-
-            # Apply filters
-            if filters:
-                if filters.get("location"):
-                    query = query.ilike("location", f"%{filters['location']}%")
-
-                if filters.get("job_type"):
-                    query = query.eq("job_type", filters["job_type"])
-
-                if filters.get("remote") is not None:
-                    query = query.eq("remote", filters["remote"])
+            job_filter = compile_filters(filters)
+            query = self.client.table("retrieveJobs").select(job_filter.select_columns())
 
-                if filters.get("experience_level"):
-                    query = query.eq("experience_level", filters["experience_level"])
-
-                if filters.get("category"):
-                    query = query.eq("category", filters["category"])
-
-                if filters.get("is_active") is not None:
-                    query = query.eq("is_active", filters["is_active"])
+            # Apply filters as PostgREST clauses
+            query = job_filter.apply_to_query(query)
 
             # Apply ordering and pagination
             query = query.order("posted_date", desc=True).range(offset, offset + limit - 1)
 
             result = query.execute()
-            return result.data
+            return job_filter.apply_residual(result.data)
 
         except Exception as e:
             print(f"Error retrieving jobs: {e}")
@@ -207,76 +333,153 @@ class JobStorage:
             return []
 
 
+    def get_skills(self) -> List[Dict]:
+        """
+        Get the skills master table (name, category, aliases)
+        Raises on failure so callers can fall back to another source
+        """
+        result = self.client.table("skills").select("*").execute()
+        return result.data
+
+
+    @staticmethod
+    def _with_skills(row: Dict) -> Dict:
+        """Turn the embedded retrieveJob_skills of a row into a skills list"""
+        row["skills"] = [skill["skill_name"] for skill in row.pop("retrieveJob_skills", None) or []]
+        return row
+
+
     def get_job_by_id(self, job_id: str) -> Optional[Dict]:
         """Get a single job by ID with skills"""
         try:
-            # Get job details
-            job_result = self.client.table("retrieveJobs").select("*").eq("id", job_id).execute()
+            result = self.client.table("retrieveJobs").select(JOB_WITH_SKILLS_SELECT).eq("id", job_id).execute()
 
-            if not job_result.data:
+            if not result.data:
                 return None
 
-            job = job_result.data[0]
+            return self._with_skills(result.data[0])
 
-            # Get job skills
-            skills_result = self.client.table("retrieveJob_skills").select("skill_name").eq(
-                "job_id", job_id
-            ).execute()
+        except Exception as e:
+            print(f"Error getting job: {e}")
+            return None
 
-            job["skills"] = [skill["skill_name"] for skill in skills_result.data]
 
-            return job
+    def get_jobs_by_ids(self, job_ids: List[str]) -> List[Dict]:
+        """
+        Get several jobs by ID with skills, in the order given
+        One request per ID_CHUNK_SIZE ids; unknown ids are skipped
+        """
+        try:
+            jobs_by_id = {}
+            for chunk in self._chunks(list(dict.fromkeys(job_ids))):
+                rows = self.client.table("retrieveJobs").select(JOB_WITH_SKILLS_SELECT).in_("id", chunk).execute()
+                jobs_by_id.update((row["id"], self._with_skills(row)) for row in rows.data)
+
+            return [jobs_by_id[job_id] for job_id in job_ids if job_id in jobs_by_id]
 
         except Exception as e:
-            print(f"Error getting job: {e}")
-            return None
+            print(f"Error getting jobs: {e}")
+            return []
 
 
     def get_jobs_with_skills(
         self,
         user_skills: List[str],
-        limit: int = 50
+        limit: int = 50,
+        min_match_percentage: float = 0
     ) -> List[Dict]:
         """
-        Get jobs that match user skills
+        Get active jobs that match user skills, best match first
         Calculates match percentage
+
+        retrieveJob_skills (indexed on skill_name) serves as the inverted
+        index: only jobs listing one of the user's skills are loaded and
+        scored, and full rows are fetched for the top `limit` only. That is
+        two requests (plus one per extra page of candidates): the
+        candidates with all their skills embedded, then the ranked rows.
+
+        This is deliberately not one embedded select returning full rows
+        (retrieveJobs!inner(*, retrieveJob_skills(skill_name))): every
+        candidate must be scored before the top `limit` is known, and for a
+        common skill the candidates are most of the table, so that request
+        would carry every candidate's description to keep `limit` of them.
         """
         try:
-            # Get all active jobs
-            jobs = self.get_jobs(limit=limit, filters={"is_active": True})
+            names = user_skill_names(user_skills)
+            if not names:
+                return []
+
+            # Active jobs listing any of the user's skills, with all their skills
+            links = self._select_pages(
+                lambda: self.client.table("retrieveJob_skills").select(
+                    "id, job_id, retrieveJobs!inner(is_active, retrieveJob_skills(skill_name))"
+                ).in_("skill_name", names).eq("retrieveJobs.is_active", True)
+            )
+
+            skills_by_job = {}
+            for link in links:
+                if link["job_id"] not in skills_by_job:
+                    skills_by_job[link["job_id"]] = [
+                        skill["skill_name"] for skill in link["retrieveJobs"]["retrieveJob_skills"]
+                    ]
+
+            if not skills_by_job:
+                return []
+
+            ranked = match_jobs(
+                [{"id": job_id, "skills": skills} for job_id, skills in skills_by_job.items()],
+                user_skills,
+                min_match_percentage,
+                limit
+            )
+
+            # Full rows for the ranked jobs only
+            jobs_by_id = {job["id"]: job for job in self.get_jobs_by_ids([job["id"] for job in ranked])}
+
+            return [
+                {**jobs_by_id[job["id"]], **job}
+                for job in ranked
+                if job["id"] in jobs_by_id
+            ]
 
-            # For each job, get skills and calculate match
-            jobs_with_match = []
-            for job in jobs:
-                job_skills_result = self.client.table("retrieveJob_skills").select(
-                    "skill_name"
-                ).eq("job_id", job["id"]).execute()
-
-                job_skills = [skill["skill_name"] for skill in job_skills_result.data]
-                job["skills"] = job_skills
-
-                # Calculate match percentage
-                if job_skills:
-                    matched_skills = set(user_skills) & set(job_skills)
-                    match_percentage = (len(matched_skills) / len(job_skills)) * 100
-                    job["match_percentage"] = round(match_percentage, 2)
-                    job["matched_skills"] = list(matched_skills)
-                    job["missing_skills"] = list(set(job_skills) - set(user_skills))
-                else:
-                    job["match_percentage"] = 0
-                    job["matched_skills"] = []
-                    job["missing_skills"] = []
+        except Exception as e:
+            print(f"Error getting jobs with skills: {e}")
+            return []
 
-                jobs_with_match.append(job)
 
-            # Sort by match percentage
-            jobs_with_match.sort(key=lambda x: x["match_percentage"], reverse=True)
+    @staticmethod
+    def _chunks(values: List, size: int = ID_CHUNK_SIZE) -> List[List]:
+        """Split values into lists of at most size, to keep in.() filters within URL limits"""
+        return [values[i:i + size] for i in range(0, len(values), size)]
 
-            return jobs_with_match
 
-        except Exception as e:
-            print(f"Error getting jobs with skills: {e}")
-            return []
+    @staticmethod
+    def _select_pages(query: Callable[[], Any]) -> List[Dict]:
+        """
+        All rows of a select, paging past the max-rows cap
+        query() builds the filtered select; it must include the id column
+        """
+        rows = []
+        start = 0
+
+        while True:
+            page = query().order("id").range(start, start + PAGE_SIZE - 1).execute()
+            rows.extend(page.data)
+            if len(page.data) < PAGE_SIZE:
+                return rows
+            start += PAGE_SIZE
+
+
+    def _job_skill_rows(self, job_ids: List[str], columns: str) -> List[Dict]:
+        """retrieveJob_skills rows of the given jobs (columns must include id)"""
+        rows = []
+
+        for chunk in self._chunks(job_ids):
+            rows.extend(self._select_pages(
+                lambda: self.client.table("retrieveJob_skills").select(columns).in_("job_id", chunk)
+            ))
+
+        return rows
 
 
     def cleanup_old_jobs(self, days: int = 30) -> int:
@@ -0,0 +1,101 @@
+"""
+Parse Memo - Remembers parsed jobs by source, external id and content hash
+The same postings come back every scheduler cycle and realtime cache miss;
+unchanged payloads reuse their parsed record instead of being parsed again
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from job_cache import JobCache
+from job_record import JobRecord
+
+
+def content_hash(job: Dict) -> str:
+    """Stable digest of a raw job payload"""
+    payload = json.dumps(job, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def copy_parsed(job: Dict) -> Dict:
+    """
+    Copy of a parsed job that callers may modify
+    Parsed values are immutable apart from the skills list
+    """
+    if isinstance(job, JobRecord):
+        return job.copy()
+
+    copied = dict(job)
+    if copied.get("skills") is not None:
+        copied["skills"] = list(copied["skills"])
+    return copied
+
+
+class ParseMemo:
+    """
+    Bounded memo of parsed jobs (LRU by size, with a TTL)
+
+    Keys combine the source, the posting's external id, a hash of the raw
+    payload and the taxonomy version, so an edited posting or a taxonomy
+    reload is parsed again. Callers always receive their own copy.
+    """
+
+    def __init__(self, max_bytes: int = None, ttl_seconds: float = None):
+        self._cache = JobCache(
+            max_bytes=max_bytes or int(os.getenv('PARSE_MEMO_MAX_MB', 32)) * 1024 * 1024,
+            ttl_seconds=ttl_seconds or int(os.getenv('PARSE_MEMO_TTL_HOURS', 24)) * 3600
+        )
+
+
+    @staticmethod
+    def key(source: str, external_id: Optional[Any], job: Dict, version: Hashable = None) -> Tuple:
+        """Memo key for a raw job"""
+        return (source, str(external_id), content_hash(job), version)
+
+
+    def get(self, key: Tuple) -> Optional[Dict]:
+        """Copy of the memoized record, or None"""
+        parsed = self._cache.get(key)
+        return copy_parsed(parsed) if parsed is not None else None
+
+
+    def put(self, key: Tuple, parsed: Dict) -> None:
+        """Remember a parsed record (a copy, so later edits by the caller don't leak in)"""
+        self._cache.set(key, copy_parsed(parsed))
+
+
+    def get_or_parse(
+        self,
+        source: str,
+        external_id: Optional[Any],
+        job: Dict,
+        parse: Callable[[Dict], Dict],
+        version: Hashable = None
+    ) -> Dict:
+        """
+        Parsed record for a raw job, calling parse(job) only if this exact
+        payload hasn't been parsed before
+        """
+        key = self.key(source, external_id, job, version)
+
+        parsed = self._cache.get(key)
+        if parsed is None:
+            parsed = parse(job)
+            self._cache.set(key, parsed)
+
+        return copy_parsed(parsed)
+
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate and memory use"""
+        return self._cache.stats()
+
+
+# Shared memo for the process
+parse_memo = ParseMemo()
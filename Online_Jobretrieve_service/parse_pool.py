@@ -0,0 +1,133 @@
+"""
+Parse Pool - Parses large job batches in worker processes
+Skill extraction is CPU-bound regex work, so threads serialize on the GIL;
+worker processes let multi-thousand-job scheduler cycles use every core
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple
+
+from skill_taxonomy import Skill, SkillTaxonomy, TaxonomySnapshot
+
+
+# (parsed job or None, error message or None), one per input job
+ParseOutcome = Tuple[Optional[Dict], Optional[str]]
+
+
+# Workers are never forked from the threaded Flask/APScheduler process:
+# forkserver where the platform has it, spawn otherwise (Windows)
+# Either way workers import the parent's __main__ module, so entry points
+# need an `if __name__ == "__main__":` guard
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+# Parser of the current worker process, set up by _init_worker
+_worker_parser = None
+
+
+def _init_worker(skills: List[Skill], version: int, source: str) -> None:
+    """Build the worker's parser with the parent's taxonomy, compiling its matcher once"""
+    global _worker_parser
+    from job_parser import JobParser
+
+    taxonomy = SkillTaxonomy.fixed(skills, version, source)
+    _worker_parser = JobParser(taxonomy=taxonomy, memo=None, pool=None)
+
+
+def _parse_chunk(source: str, jobs: List[Dict], keep_html: bool) -> List[ParseOutcome]:
+    _worker_parser.keep_html = keep_html
+    return parse_each(lambda job: _worker_parser.parse_job(job, source), jobs)
+
+
+def parse_each(parse: Callable[[Dict], Dict], jobs: List[Dict]) -> List[ParseOutcome]:
+    """Parse jobs one by one, recording failures instead of raising"""
+    outcomes = []
+
+    for job in jobs:
+        try:
+            outcomes.append((parse(job), None))
+        except Exception as e:
+            outcomes.append((None, f"{type(e).__name__}: {e}"))
+
+    return outcomes
+
+
+class ParsePool:
+    """
+    Process pool whose workers share the parent's taxonomy snapshot
+    The pool is started on first use and restarted when the taxonomy is reloaded
+    """
+
+    def __init__(self, max_workers: int = None, timeout_seconds: float = None):
+        self.max_workers = max_workers or int(os.getenv('PARSE_POOL_WORKERS', 0)) or os.cpu_count() or 1
+        # Longest a batch may take before the pool is given up on
+        self.timeout_seconds = timeout_seconds or float(os.getenv('PARSE_POOL_TIMEOUT_SECONDS', 60))
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._snapshot: Optional[TaxonomySnapshot] = None
+
+
+    def _get_executor(self, snapshot: TaxonomySnapshot) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._snapshot is not snapshot:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(_START_METHOD),
+                    initializer=_init_worker,
+                    initargs=(list(snapshot.skills.values()), snapshot.version, snapshot.source)
+                )
+                self._snapshot = snapshot
+
+            return self._executor
+
+
+    def parse(
+        self,
+        source: str,
+        jobs: List[Dict],
+        snapshot: TaxonomySnapshot,
+        keep_html: bool = False
+    ) -> List[ParseOutcome]:
+        """
+        Parse jobs across the workers, preserving input order
+        Raises BrokenProcessPool if a worker dies, or TimeoutError if the
+        batch takes longer than timeout_seconds; the pool is discarded first
+        """
+        executor = self._get_executor(snapshot)
+
+        # A few chunks per worker keeps them busy without much pickling overhead
+        chunk_size = max(50, -(-len(jobs) // (self.max_workers * 4)))
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+
+        deadline = time.monotonic() + self.timeout_seconds
+
+        try:
+            futures = [executor.submit(_parse_chunk, source, chunk, keep_html) for chunk in chunks]
+            return [
+                outcome
+                for future in futures
+                for outcome in future.result(timeout=max(0, deadline - time.monotonic()))
+            ]
+        except (BrokenProcessPool, TimeoutError):
+            self.shutdown()
+            raise
+
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._snapshot = None
+
+
+# Shared pool for the process
+parse_pool = ParsePool()
@@ -0,0 +1,230 @@
+"""
+Rate Limiter - Per-source token buckets and a persisted monthly quota ledger
+Keeps upstream job APIs within their request rates and free-tier quotas
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# Request rate (per second), burst size and monthly quota for each source.
+# A quota of None means the source has no monthly limit.
+DEFAULT_SOURCE_LIMITS = {
+    "jsearch": {"rate": 1.0, "burst": 1, "monthly_quota": int(os.getenv('JSEARCH_MONTHLY_QUOTA', 250))},
+    "adzuna": {"rate": 2.0, "burst": 2, "monthly_quota": int(os.getenv('ADZUNA_MONTHLY_QUOTA', 5000))},
+    "remotive": {"rate": 2.0, "burst": 2, "monthly_quota": None},
+    "arbeitnow": {"rate": 2.0, "burst": 2, "monthly_quota": None},
+    "themuse": {"rate": 2.0, "burst": 2, "monthly_quota": None}
+}
+
+
+class QuotaExceededError(Exception):
+    """Raised when a source has used up its quota for the current period"""
+
+    def __init__(self, source: str, quota: int):
+        super().__init__(f"{source}: monthly quota of {quota} requests used up")
+        self.source = source
+        self.quota = quota
+
+
+class TokenBucket:
+    """Thread-safe token bucket; callers only wait when the bucket is empty"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+    def acquire(self, tokens: float = 1, deadline: Optional[float] = None) -> bool:
+        """
+        Take tokens from the bucket, sleeping until they are available
+        Returns False without taking anything if that would pass the deadline
+        (a time.monotonic() value)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            if deadline is not None and now + wait > deadline:
+                return False
+
+            # Reserve the tokens now so concurrent callers queue up behind us
+            self._tokens -= tokens
+
+        if wait > 0:
+            time.sleep(wait)
+
+        return True
+
+
+class QuotaLedger:
+    """
+    Persists request counts per source and calendar month in SQLite
+    Shared by every process that points at the same ledger file
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv(
+            'QUOTA_LEDGER_PATH', str(Path(__file__).parent / 'quota_ledger.db')
+        )
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS quota_usage (
+                    source TEXT NOT NULL,
+                    period TEXT NOT NULL,
+                    calls INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (source, period)
+                )
+                """
+            )
+
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived autocommit connection; transactions are explicit"""
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+    @staticmethod
+    def current_period() -> str:
+        """Quota period key, e.g. 2024-01 (quotas reset monthly, UTC)"""
+        return datetime.now(timezone.utc).strftime("%Y-%m")
+
+
+    def usage(self, source: str, period: str = None) -> int:
+        """Number of requests recorded for a source in a period"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT calls FROM quota_usage WHERE source = ? AND period = ?",
+                (source, period or self.current_period())
+            ).fetchone()
+
+        return row[0] if row else 0
+
+
+    def try_consume(self, source: str, quota: int, calls: int = 1) -> bool:
+        """
+        Atomically record calls for a source if they fit in its quota
+        Returns False (recording nothing) when the quota would be exceeded
+        """
+        period = self.current_period()
+
+        with self._lock, self._connect() as conn:
+            # IMMEDIATE takes the write lock up front so other processes can't
+            # read the same count between our check and our update
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT calls FROM quota_usage WHERE source = ? AND period = ?",
+                    (source, period)
+                ).fetchone()
+                used = row[0] if row else 0
+
+                if used + calls > quota:
+                    conn.execute("ROLLBACK")
+                    return False
+
+                conn.execute(
+                    """
+                    INSERT INTO quota_usage (source, period, calls) VALUES (?, ?, ?)
+                    ON CONFLICT(source, period) DO UPDATE SET calls = calls + excluded.calls
+                    """,
+                    (source, period, calls)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        return True
+
+
+class RateLimiter:
+    """Applies the token bucket and monthly quota of each job source"""
+
+    def __init__(self, limits: Dict[str, Dict] = None, ledger: QuotaLedger = None):
+        self.limits = limits or DEFAULT_SOURCE_LIMITS
+        self.ledger = ledger or QuotaLedger()
+        self._buckets = {
+            source: TokenBucket(limit["rate"], limit["burst"])
+            for source, limit in self.limits.items()
+        }
+
+
+    def quota_remaining(self, source: str) -> Optional[int]:
+        """Requests left this month, or None if the source has no quota"""
+        quota = self.limits.get(source, {}).get("monthly_quota")
+        if quota is None:
+            return None
+
+        return max(0, quota - self.ledger.usage(source))
+
+
+    def has_quota(self, source: str) -> bool:
+        """Check whether a source can still be called this month"""
+        remaining = self.quota_remaining(source)
+        return remaining is None or remaining > 0
+
+
+    def acquire(self, source: str, deadline: Optional[float] = None) -> bool:
+        """
+        Wait for permission to send one request to a source
+
+        Returns False if the rate limit can't admit the request before the
+        deadline; raises QuotaExceededError once the monthly quota is used up
+        """
+        limit = self.limits.get(source)
+        if not limit:
+            return True
+
+        bucket = self._buckets[source]
+        if not bucket.acquire(deadline=deadline):
+            return False
+
+        quota = limit.get("monthly_quota")
+        if quota is not None and not self.ledger.try_consume(source, quota):
+            raise QuotaExceededError(source, quota)
+
+        return True
+
+
+    def quota_status(self) -> Dict[str, Dict]:
+        """Current month's usage for every source with a quota"""
+        status = {}
+
+        for source, limit in self.limits.items():
+            quota = limit.get("monthly_quota")
+            if quota is None:
+                continue
+
+            used = self.ledger.usage(source)
+            status[source] = {
+                "period": self.ledger.current_period(),
+                "used": used,
+                "quota": quota,
+                "remaining": max(0, quota - used)
+            }
+
+        return status
@@ -4,10 +4,18 @@ Includes links to LinkedIn, BDjobs, Glassdoor, and other job platforms
 """
 
 import os
+import threading
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from job_fetcher import JobFetcher
+from typing import List, Dict, Optional, Tuple
+from job_fetcher import JobFetcher, SOURCE_OK, SOURCE_SKIPPED, SOURCE_TIMED_OUT, SOURCE_ERROR
 from job_parser import JobParser
+from job_sources import get_source
+from single_flight import SingleFlight
+from job_cache import JobCache
+from job_filters import compile_filters
+from job_index import JobIndex
+from job_record import as_dicts
+from job_matcher import SkillMatrix, match_jobs, match_job_sets
 import json
 
 
@@ -18,9 +26,21 @@ class RealtimeJobService:
         self.fetcher = JobFetcher()
         self.parser = JobParser()
 
-        # Simple in-memory cache (expires after 30 minutes)
-        self._cache = {}
-        self._cache_duration = timedelta(minutes=30)
+        # Bounded in-memory LRU cache (fresh for CACHE_DURATION_MINUTES, then
+        # served stale for CACHE_STALE_GRACE_MINUTES while it is refreshed)
+        self._cache_duration = timedelta(minutes=int(os.getenv('CACHE_DURATION_MINUTES', 30)))
+        self._stale_grace = timedelta(minutes=int(os.getenv('CACHE_STALE_GRACE_MINUTES', 10)))
+        self._cache = JobCache(
+            max_bytes=int(os.getenv('CACHE_MAX_MB', 64)) * 1024 * 1024,
+            ttl_seconds=(self._cache_duration + self._stale_grace).total_seconds()
+        )
+
+        # Keys with a background refresh running
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+
+        # Coalesces concurrent cache misses for the same search into one fetch
+        self._in_flight = SingleFlight()
 
 
     def _generate_platform_links(self, query: str, location: str = "") -> Dict[str, str]:
@@ -57,10 +77,31 @@ class RealtimeJobService:
         return links
 
 
-    def _get_cache_key(self, query: str, location: str, sources: List[str]) -> str:
-        """Generate cache key"""
-        sources_str = "-".join(sorted(sources))
-        return f"{query}:{location}:{sources_str}"
+    def _normalize(self, text: Optional[str]) -> str:
+        """Lowercase and collapse whitespace for use in cache keys"""
+        return " ".join((text or "").lower().split())
+
+
+    def _get_cache_key(self, query: str, location: str, source: str) -> str:
+        """
+        Generate the cache key of one source's results (case and whitespace insensitive)
+        Sources that ignore the query or location share one entry across them
+        """
+        adapter = get_source(source)
+        query_key = self._normalize(query) if adapter is None or adapter.query_aware else "*"
+        location_key = self._normalize(location) if adapter is None or adapter.location_aware else "*"
+        return f"{source}:{query_key}:{location_key}"
+
+
+    def _get_flight_key(self, query: str, location: str, sources: List[str]) -> str:
+        """Key shared by concurrent fetches of the same sources for the same search"""
+        sources_str = "-".join(sorted(set(sources)))
+        return f"{self._normalize(query)}:{self._normalize(location)}:{sources_str}"
+
+
+    def _cache_age(self, cached_data: Dict) -> timedelta:
+        """Time since the cached data was fetched"""
+        return datetime.now() - datetime.fromisoformat(cached_data.get("timestamp", ""))
 
 
     def _is_cache_valid(self, cached_data: Dict) -> bool:
@@ -68,8 +109,44 @@ class RealtimeJobService:
         if not cached_data:
             return False
 
-        cached_time = datetime.fromisoformat(cached_data.get("timestamp", ""))
-        return datetime.now() - cached_time < self._cache_duration
+        return self._cache_age(cached_data) < self._cache_duration
+
+
+    def _is_cache_servable_stale(self, cached_data: Dict) -> bool:
+        """Check if expired cached data is still within the stale grace window"""
+        if not cached_data:
+            return False
+
+        return self._cache_age(cached_data) < self._cache_duration + self._stale_grace
+
+
+    def _refresh_in_background(
+        self,
+        query: str,
+        location: str,
+        sources: List[str]
+    ) -> None:
+        """Re-fetch stale sources on a daemon thread (at most one refresh per key)"""
+        flight_key = self._get_flight_key(query, location, sources)
+
+        with self._refreshing_lock:
+            if flight_key in self._refreshing:
+                return
+            self._refreshing.add(flight_key)
+
+        def refresh():
+            try:
+                self._in_flight.do(
+                    flight_key,
+                    lambda: self._fetch_and_cache(query, location, sources)
+                )
+            except Exception as e:
+                print(f"[CACHE] Background refresh failed for {query}: {e}")
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(flight_key)
+
+        threading.Thread(target=refresh, name="job-cache-refresh", daemon=True).start()
 
 
     def fetch_jobs_realtime(
@@ -77,20 +154,71 @@ class RealtimeJobService:
         query: str = "software developer",
         location: str = "United States",
         sources: List[str] = None,
-        use_cache: bool = True
+        use_cache: bool = True,
+        deadline_ms: Optional[int] = None,
+        filters: Dict = None
     ) -> Dict:
         """
         Fetch jobs in real-time from multiple sources
 
+        Results are cached per source, so searches for different source
+        subsets share data and only the sources missing from the cache are
+        fetched.
+
         Args:
             query: Job search query
             location: Location to search
             sources: List of sources to fetch from (default: all free sources)
-            use_cache: Whether to use cached results (default: True)
+            use_cache: Whether to use cached results (default: True); expired
+                       results within the grace window are returned with
+                       "stale": true while a background refresh runs
+            deadline_ms: Latency budget in milliseconds; sources that don't
+                         finish in time are left out and flagged in stats
+            filters: Optional job filters (see job_filters.JobFilter); the
+                     response then holds the matching jobs and facet counts
 
         Returns:
             Dictionary with jobs and platform links
         """
+        return self._search(query, location, sources, use_cache, deadline_ms, filters)[0]
+
+
+    def match_jobs_realtime(
+        self,
+        query: str,
+        location: str,
+        user_skills: List[str],
+        sources: List[str] = None,
+        min_match_percentage: float = 0,
+        limit: Optional[int] = None,
+        use_cache: bool = True,
+        deadline_ms: Optional[int] = None
+    ) -> Dict:
+        """
+        Search like fetch_jobs_realtime, then rank the results against user_skills
+
+        Each source entry keeps a SkillMatrix built on first use, so only
+        the jobs sharing a skill with the user are scored. The response
+        gains "matched_jobs" (copies with match information, best first).
+        """
+        response, sources, entries = self._search(query, location, sources, use_cache, deadline_ms)
+
+        matrices = [self._entry_matrix(entries[source]) for source in sources]
+        response["matched_jobs"] = match_job_sets(matrices, user_skills, min_match_percentage, limit)
+
+        return response
+
+
+    def _search(
+        self,
+        query: str,
+        location: str,
+        sources: Optional[List[str]],
+        use_cache: bool = True,
+        deadline_ms: Optional[int] = None,
+        filters: Dict = None
+    ) -> Tuple[Dict, List[str], Dict[str, Dict]]:
+        """Search response, the sources searched and their per-source entries"""
         # Default to free sources that don't require API keys
         if sources is None:
             sources = ["remotive", "themuse"]
@@ -102,48 +230,215 @@ class RealtimeJobService:
                 sources.append("adzuna")
 
         # Check cache
-        cache_key = self._get_cache_key(query, location, sources)
-        if use_cache and cache_key in self._cache:
-            cached_data = self._cache[cache_key]
+        entries = {}
+        stale_sources = []
+        missing_sources = []
+
+        for source in sources:
+            cached_data = self._cache.get(self._get_cache_key(query, location, source)) if use_cache else None
+
             if self._is_cache_valid(cached_data):
-                print(f"[CACHE] Returning cached results for: {query}")
-                return cached_data["data"]
+                entries[source] = cached_data
+            elif self._is_cache_servable_stale(cached_data):
+                # Stale-while-revalidate: answer now, refresh for the next caller
+                entries[source] = cached_data
+                stale_sources.append(source)
+            else:
+                missing_sources.append(source)
+
+        if entries:
+            print(f"[CACHE] Cached results for: {query} ({', '.join(entries)})")
+
+        if stale_sources:
+            print(f"[CACHE] Refreshing stale sources: {', '.join(stale_sources)}")
+            self._refresh_in_background(query, location, stale_sources)
+
+        if missing_sources:
+            entries.update(self._fetch_missing(query, location, missing_sources, deadline_ms))
+
+        response = self._build_response(query, location, sources, entries, filters)
 
-        print(f"[FETCH] Fetching real-time jobs for: {query} in {location}")
+        cached_ages = [
+            self._cache_age(entries[source]) for source in sources
+            if source not in missing_sources
+        ]
+        if cached_ages:
+            response["stale"] = bool(stale_sources)
+            response["cache_age_seconds"] = int(max(cached_ages).total_seconds())
 
-        # Fetch jobs from all sources
-        all_jobs_raw = self.fetcher.fetch_all_sources(query, location)
+        return response, sources, entries
 
-        # Filter to requested sources
-        filtered_jobs = {
-            source: jobs for source, jobs in all_jobs_raw.items()
-            if source in sources
+
+    def _fetch_missing(
+        self,
+        query: str,
+        location: str,
+        sources: List[str],
+        deadline_ms: Optional[int] = None
+    ) -> Dict[str, Dict]:
+        """Fetch sources that weren't cached, sharing the fetch with concurrent identical requests"""
+        try:
+            entries, shared = self._in_flight.do(
+                self._get_flight_key(query, location, sources),
+                lambda: self._fetch_and_cache(query, location, sources, deadline_ms),
+                timeout=deadline_ms / 1000 if deadline_ms else None
+            )
+        except TimeoutError:
+            # Our budget ran out while waiting on another caller's fetch
+            return {source: self._make_entry([], SOURCE_TIMED_OUT) for source in sources}
+
+        if shared:
+            print(f"[COALESCE] Shared in-flight fetch for: {query}")
+
+        return entries
+
+
+    def _make_entry(self, jobs: List[Dict], status: str) -> Dict:
+        """Per-source result as stored in the cache"""
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "status": status,
+            "jobs": jobs
         }
 
-        # Parse jobs
-        parsed_jobs = []
-        stats = {"total": 0, "by_source": {}}
 
-        for source, jobs in filtered_jobs.items():
-            source_jobs = []
+    def _fetch_and_cache(
+        self,
+        query: str,
+        location: str,
+        sources: List[str],
+        deadline_ms: Optional[int] = None
+    ) -> Dict[str, Dict]:
+        """Fetch and parse jobs from upstream, caching each source that succeeded"""
+        print(f"[FETCH] Fetching real-time jobs for: {query} in {location} ({', '.join(sources)})")
+
+        all_jobs_raw, source_status = self.fetcher.fetch_all_sources_with_status(
+            query, location, deadline_ms=deadline_ms, sources=sources
+        )
+
+        entries = {}
+        for source in sources:
+            status = source_status.get(source, SOURCE_SKIPPED)
+            entries[source] = self._make_entry(
+                self._parse_source_jobs(source, all_jobs_raw.get(source, [])),
+                status
+            )
+
+            # Failed sources aren't cached, so the next request retries them
+            if status == SOURCE_OK:
+                # Kept on the entry so structures attached later are counted against it
+                cache_key = entries[source]["cache_key"] = self._get_cache_key(query, location, source)
+                if not self._cache.set(cache_key, entries[source]):
+                    print(f"[CACHE] {source} results for {query} exceed CACHE_MAX_MB, not cached")
+
+        return entries
+
+
+    def _parse_source_jobs(self, source: str, jobs: List[Dict]) -> List[Dict]:
+        """Parse raw jobs of one source, adding platform information"""
+        source_jobs = []
+        parsed_jobs, errors = self.parser.parse_batch(jobs, source)
+
+        for index, error in errors.items():
+            print(f"[ERROR] Parsing job from {source}: {error}")
+
+        for parsed_job in parsed_jobs:
+            if parsed_job is None:
+                continue
+
+            # Add platform information
+            parsed_job["external_platform"] = self._identify_platform(
+                parsed_job.get("apply_url", "")
+            )
+
+            source_jobs.append(parsed_job)
+
+        return source_jobs
 
-            for job in jobs:
-                try:
-                    parsed_job = self.parser.parse_job(job, source)
 
-                    # Add platform information
-                    parsed_job["external_platform"] = self._identify_platform(
-                        parsed_job.get("apply_url", "")
-                    )
+    def _entry_index(self, entry: Dict) -> JobIndex:
+        """Bitmap index of a per-source entry, built the first time it is filtered"""
+        index = entry.get("index")
+        if index is None:
+            index = self._attach(entry, "index", JobIndex(entry["jobs"]))
+        return index
 
-                    source_jobs.append(parsed_job)
-                except Exception as e:
-                    print(f"[ERROR] Parsing job from {source}: {e}")
-                    continue
 
-            parsed_jobs.extend(source_jobs)
-            stats["by_source"][source] = len(source_jobs)
-            stats["total"] += len(source_jobs)
+    def _entry_matrix(self, entry: Dict) -> SkillMatrix:
+        """Skill matrix of a per-source entry, built the first time it is matched against"""
+        matrix = entry.get("matrix")
+        if matrix is None:
+            matrix = self._attach(entry, "matrix", SkillMatrix(entry["jobs"]))
+        return matrix
+
+
+    def _attach(self, entry: Dict, name: str, built):
+        """
+        Attach a structure built over an entry's jobs, unless a concurrent
+        request attached one first, and count it against the cache budget
+        """
+        attached = entry.setdefault(name, built)
+        if attached is built and "cache_key" in entry:
+            self._cache.add_size(entry["cache_key"], entry, built.nbytes)
+        return attached
+
+
+    def _filter_entries(
+        self,
+        sources: List[str],
+        entries: Dict[str, Dict],
+        filters: Dict
+    ) -> Tuple[List[Dict], Dict[str, Dict[str, int]]]:
+        """Jobs matching filters across the entries, and facet counts over those jobs"""
+        job_filter = compile_filters(filters)
+        jobs = []
+        facets: Dict[str, Dict[str, int]] = {}
+
+        for source in sources:
+            index = self._entry_index(entries[source])
+            selected = index.select(job_filter)
+            jobs.extend(index.jobs_for(selected))
+
+            for dimension, counts in index.facets(selected).items():
+                merged = facets.setdefault(dimension, {})
+                for value, count in counts.items():
+                    merged[value] = merged.get(value, 0) + count
+
+        facets = {
+            dimension: dict(sorted(counts.items(), key=lambda item: -item[1]))
+            for dimension, counts in facets.items()
+        }
+        return jobs, facets
+
+
+    def _build_response(
+        self,
+        query: str,
+        location: str,
+        sources: List[str],
+        entries: Dict[str, Dict],
+        filters: Dict = None
+    ) -> Dict:
+        """Assemble the search response from per-source entries"""
+        parsed_jobs = []
+        stats = {
+            "total": 0,
+            "by_source": {},
+            "source_status": {}
+        }
+
+        for source in sources:
+            entry = entries[source]
+            stats["source_status"][source] = entry["status"]
+
+            parsed_jobs.extend(entry["jobs"])
+            stats["by_source"][source] = len(entry["jobs"])
+            stats["total"] += len(entry["jobs"])
+
+        stats["partial"] = any(
+            status in (SOURCE_TIMED_OUT, SOURCE_ERROR)
+            for status in stats["source_status"].values()
+        )
 
         # Generate platform links
         platform_links = self._generate_platform_links(query, location)
@@ -156,14 +451,17 @@ class RealtimeJobService:
             "stats": stats,
             "jobs": parsed_jobs,
             "platform_links": platform_links,
-            "message": f"Found {stats['total']} real-time jobs from {len(filtered_jobs)} sources"
+            "message": f"Found {stats['total']} real-time jobs from {len(stats['by_source'])} sources"
         }
 
-        # Cache the results
-        self._cache[cache_key] = {
-            "timestamp": datetime.now().isoformat(),
-            "data": response
-        }
+        if filters:
+            response["jobs"], response["facets"] = self._filter_entries(sources, entries, filters)
+            stats["original_total"] = stats["total"]
+            stats["filtered_total"] = len(response["jobs"])
+
+        # Cached entries hold JobRecords; responses carry plain dicts so the
+        # blueprints serialize under any host app's JSON provider
+        response["jobs"] = as_dicts(response["jobs"])
 
         return response
 
@@ -199,46 +497,23 @@ class RealtimeJobService:
         self,
         jobs: List[Dict],
         user_skills: List[str],
-        min_match_percentage: float = 0
+        min_match_percentage: float = 0,
+        limit: Optional[int] = None
     ) -> List[Dict]:
         """
         Match jobs to user skills and calculate match percentage
 
         Args:
             jobs: List of job dictionaries
-            user_skills: List of user's skills
+            user_skills: List of user's skills (any case, aliases allowed)
             min_match_percentage: Minimum match percentage to include (0-100)
+            limit: Return only the best `limit` matches
 
         Returns:
-            List of jobs with match information, sorted by match percentage
+            Copies of the jobs with match information, sorted by match
+            percentage; the (cached) jobs passed in are not modified
         """
-        matched_jobs = []
-
-        for job in jobs:
-            job_skills = job.get("skills", [])
-
-            if not job_skills:
-                # No skills listed, include with 0% match
-                job["match_percentage"] = 0
-                job["matched_skills"] = []
-                job["missing_skills"] = []
-            else:
-                # Calculate match
-                matched_skills = set(user_skills) & set(job_skills)
-                match_percentage = (len(matched_skills) / len(job_skills)) * 100
-
-                job["match_percentage"] = round(match_percentage, 2)
-                job["matched_skills"] = list(matched_skills)
-                job["missing_skills"] = list(set(job_skills) - set(user_skills))
-
-            # Include if meets minimum match percentage
-            if job["match_percentage"] >= min_match_percentage:
-                matched_jobs.append(job)
-
-        # Sort by match percentage (highest first)
-        matched_jobs.sort(key=lambda x: x["match_percentage"], reverse=True)
-
-        return matched_jobs
+        return match_jobs(jobs, user_skills, min_match_percentage, limit)
 
 
     def get_skill_gap_analysis(
@@ -300,10 +575,21 @@ class RealtimeJobService:
 
     def clear_cache(self):
         """Clear the cache"""
-        self._cache = {}
+        self._cache.clear()
         print("[CACHE] Cache cleared")
 
 
+    @property
+    def cache_duration(self) -> timedelta:
+        """How long results are served as fresh (CACHE_DURATION_MINUTES)"""
+        return self._cache_duration
+
+
+    def cache_stats(self) -> Dict:
+        """Cache hit/miss/eviction counters and memory use"""
+        return self._cache.stats()
+
+
 # Singleton instance
 realtime_job_service = RealtimeJobService()
 
@@ -8,6 +8,8 @@ from flask import Blueprint, request, jsonify
 # Import services from parent directory
 from realtime_job_service import realtime_job_service
 from job_analytics import JobAnalytics
+from skill_taxonomy import skill_taxonomy
+from parse_memo import parse_memo
 
 # Create blueprint with /api/jobs prefix
 job_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
@@ -16,76 +18,6 @@ job_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
 analytics_service = JobAnalytics()
 
 
-def filter_jobs(jobs, filters):
-    """
-    Filter jobs based on criteria
-
-    Filters:
-    - job_type: full-time, part-time, contract, internship
-    - experience_level: entry, mid, senior
-    - remote: true/false
-    - min_salary: minimum salary
-    - max_salary: maximum salary
-    - skills: list of required skills
-    - company: company name (partial match)
-    - location: location (partial match)
-    """
-    if not filters:
-        return jobs
-
-    filtered = []
-
-    for job in jobs:
-        # Filter by job type
-        if 'job_type' in filters:
-            if job.get('job_type', '').lower() != filters['job_type'].lower():
-                continue
-
-        # Filter by experience level
-        if 'experience_level' in filters:
-            if job.get('experience_level', '').lower() != filters['experience_level'].lower():
-                continue
-
-        # Filter by remote
-        if 'remote' in filters:
-            remote_filter = str(filters['remote']).lower() == 'true'
-            if job.get('remote', False) != remote_filter:
-                continue
-
-        # Filter by minimum salary
-        if 'min_salary' in filters:
-            job_min = job.get('salary_min')
-            if not job_min or job_min < filters['min_salary']:
-                continue
-
-        # Filter by maximum salary
-        if 'max_salary' in filters:
-            job_max = job.get('salary_max')
-            if not job_max or job_max > filters['max_salary']:
-                continue
-
-        # Filter by skills (job must have at least one of the required skills)
-        if 'skills' in filters and filters['skills']:
-            job_skills = [s.lower() for s in job.get('skills', [])]
-            required_skills = [s.lower() for s in filters['skills']]
-            if not any(skill in job_skills for skill in required_skills):
-                continue
-
-        # Filter by company (partial match)
-        if 'company' in filters:
-            if filters['company'].lower() not in job.get('company', '').lower():
-                continue
-
-        # Filter by location (partial match)
-        if 'location' in filters:
-            if filters['location'].lower() not in job.get('location', '').lower():
-                continue
-
-        filtered.append(job)
-
-    return filtered
-
-
 @job_bp.route('/search', methods=['POST'])
 def search_jobs():
     """
@@ -97,6 +29,7 @@ def search_jobs():
         "location": "Remote",
         "sources": ["remotive", "themuse", "jsearch"],  // optional
         "use_cache": true,  // optional, default true (30 min cache)
+        "deadline_ms": 3000,  // optional latency budget; slow sources are left out
         "filters": {  // optional filters
             "job_type": "full-time",
             "experience_level": "senior",
@@ -116,26 +49,24 @@ def search_jobs():
         location = data.get('location', 'United States')
         sources = data.get('sources')
         use_cache = data.get('use_cache', True)
+        deadline_ms = data.get('deadline_ms')
         filters = data.get('filters', {})
 
-        # Fetch real-time jobs
+        # Rename location_filter to location for the filter engine
+        if 'location_filter' in filters:
+            filters['location'] = filters.pop('location_filter')
+
+        # Fetch real-time jobs; filters run on the cached results' bitmap indexes
         result = realtime_job_service.fetch_jobs_realtime(
             query=query,
             location=location,
             sources=sources,
-            use_cache=use_cache
+            use_cache=use_cache,
+            deadline_ms=int(deadline_ms) if deadline_ms else None,
+            filters=filters
         )
 
-        # Apply filters
-        original_count = len(result['jobs'])
         if filters:
-            # Rename location_filter to location for the filter function
-            if 'location_filter' in filters:
-                filters['location'] = filters.pop('location_filter')
-
-            result['jobs'] = filter_jobs(result['jobs'], filters)
-            result['stats']['original_total'] = original_count
-            result['stats']['filtered_total'] = len(result['jobs'])
             result['filters_applied'] = filters
 
         return jsonify({
@@ -162,6 +93,7 @@ def match_jobs_to_user():
         "location": "Remote",
         "user_skills": ["Python", "Django", "React"],
         "min_match_percentage": 30,
+        "limit": 20,  // optional, best matches only
         "sources": ["remotive", "themuse"]
     }
     """
@@ -178,21 +110,19 @@ def match_jobs_to_user():
         location = data.get('location', 'Remote')
         user_skills = data.get('user_skills', [])
         min_match = data.get('min_match_percentage', 0)
+        limit = data.get('limit')
         sources = data.get('sources')
 
-        # Fetch jobs
-        result = realtime_job_service.fetch_jobs_realtime(
+        # Fetch jobs and match them to user skills (only jobs sharing a skill are scored)
+        result = realtime_job_service.match_jobs_realtime(
             query=query,
             location=location,
-            sources=sources
-        )
-
-        # Match to user skills
-        matched_jobs = realtime_job_service.match_jobs_to_skills(
-            jobs=result['jobs'],
             user_skills=user_skills,
-            min_match_percentage=min_match
+            sources=sources,
+            min_match_percentage=min_match,
+            limit=int(limit) if limit else None
         )
+        matched_jobs = result['matched_jobs']
 
         return jsonify({
             "success": True,
@@ -315,6 +245,7 @@ def quick_search():
     - q: Search query (required)
     - location: Location (optional, default: "United States")
     - limit: Number of results (optional, default: 50)
+    - deadline_ms: Latency budget in milliseconds (optional)
     - job_type: Filter by job type
     - experience_level: Filter by level
     - remote: Filter remote jobs
@@ -333,6 +264,7 @@ def quick_search():
 
         location = request.args.get('location', 'United States')
         limit = int(request.args.get('limit', 50))
+        deadline_ms = request.args.get('deadline_ms', type=int)
 
         # Build filters from query parameters
         filters = {}
@@ -365,15 +297,12 @@ def quick_search():
         result = realtime_job_service.fetch_jobs_realtime(
             query=query,
             location=location,
-            sources=None
+            sources=None,
+            deadline_ms=deadline_ms,
+            filters=filters
         )
 
-        # Apply filters
-        original_count = len(result['jobs'])
         if filters:
-            result['jobs'] = filter_jobs(result['jobs'], filters)
-            result['stats']['original_total'] = original_count
-            result['stats']['filtered_total'] = len(result['jobs'])
             result['filters_applied'] = filters
 
         # Limit results
@@ -436,20 +365,17 @@ def get_analytics():
         location = data.get('location', 'United States')
         sources = data.get('sources')
         filters = data.get('filters', {})
+        if 'location_filter' in filters:
+            filters['location'] = filters.pop('location_filter')
 
         # Fetch jobs
         result = realtime_job_service.fetch_jobs_realtime(
             query=query,
             location=location,
-            sources=sources
+            sources=sources,
+            filters=filters
         )
-
-        # Apply filters if provided
-        jobs = result['jobs']
-        if filters:
-            if 'location_filter' in filters:
-                filters['location'] = filters.pop('location_filter')
-            jobs = filter_jobs(jobs, filters)
+        jobs = result['jobs']  # Already filtered
 
         # Generate analytics
         analytics = analytics_service.generate_analytics(jobs)
@@ -458,7 +384,7 @@ def get_analytics():
             "success": True,
             "query": query,
             "location": location,
-            "total_jobs_fetched": len(result['jobs']),
+            "total_jobs_fetched": result['stats']['total'],
             "jobs_analyzed": len(jobs),
             "filters_applied": filters if filters else None,
             "analytics": analytics
@@ -566,6 +492,33 @@ def get_location_insights():
         }), 500
 
 
+@job_bp.route('/skills/reload', methods=['POST'])
+def reload_skill_taxonomy():
+    """
+    Reload the skill taxonomy (file or skills table) without a restart
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        snapshot = skill_taxonomy.reload()
+
+        # Cached results keep the skills they were parsed with until they expire
+        if data.get('clear_cache'):
+            realtime_job_service.clear_cache()
+
+        return jsonify({
+            "success": True,
+            "message": "Skill taxonomy reloaded",
+            "skill_taxonomy": snapshot.info()
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "message": "Error reloading skill taxonomy"
+        }), 500
+
+
 @job_bp.route('/health', methods=['GET'])
 def health_check():
     """Check if the job service is working"""
@@ -586,7 +539,11 @@ def health_check():
             "message": "Job retrieval service is running",
             "available_sources": available_sources,
             "cache_enabled": True,
-            "cache_duration_minutes": 30
+            "cache_duration_minutes": int(realtime_job_service.cache_duration.total_seconds() // 60),
+            "cache": realtime_job_service.cache_stats(),
+            "quota": realtime_job_service.fetcher.rate_limiter.quota_status(),
+            "skill_taxonomy": skill_taxonomy.snapshot().info(),
+            "parse_memo": parse_memo.stats()
         }), 200
 
     except Exception as e:
@@ -0,0 +1,80 @@
+"""
+Single-Flight - Coalesces concurrent calls for the same key into one execution
+The first caller runs the work; concurrent callers wait for and share its result
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """An in-flight call and the outcome its waiters will receive"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-safe duplicate call suppression keyed by an arbitrary hashable"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        timeout: Optional[float] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        Args:
+            key: Identifies duplicate work
+            fn: Zero-argument callable producing the result
+            timeout: Max seconds a waiting caller blocks (the running caller
+                     is never interrupted)
+
+        Returns:
+            Tuple of (result, shared) where shared is True for callers that
+            received another caller's result
+
+        Raises:
+            Whatever fn raised (re-raised in every waiting caller), or
+            TimeoutError if a waiting caller gave up first
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError(f"Timed out waiting for in-flight call: {key}")
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
+
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed"""
+        with self._lock:
+            return len(self._calls)
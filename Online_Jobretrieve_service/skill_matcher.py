@@ -0,0 +1,123 @@
+"""
+Skill Matcher - Finds every known skill in a text in one pass
+Compiles the skill keywords into a single prefix-tree (trie) shaped regex
+with word-boundary guards, so "java" doesn't match inside "javascript"
+and "r" doesn't match inside every other word
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Tuple, Union
+
+
+# Characters that continue a token; a skill must not be touching one on
+# either side ("c++" and "c#" end in symbols, "R&D" isn't the R language)
+_TOKEN_CHARS = r"\w+#&"
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Alternation of the keywords factored by common prefix
+    ("react", "react native", "redis" -> r(?:e(?:act(?: native)?|dis))), so the
+    regex engine rejects a position after a character or two instead of
+    trying every keyword. Longer keywords are preferred over their prefixes.
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: Dict) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            # A keyword ends here; the longer continuations are optional
+            return f"(?:{body})?"
+        return body
+
+    return emit(trie)
+
+
+def keyword_pattern(keywords: Iterable[str]) -> str:
+    """Regex source matching any of the (lowercase) keywords as a whole token"""
+    return rf"(?<![{_TOKEN_CHARS}])(?:{_trie_pattern(keywords)})(?![{_TOKEN_CHARS}])"
+
+
+class KeywordPattern:
+    """
+    A keyword regex run against lowercased text
+    Matching lowercase text case-sensitively is about twice as fast as
+    re.IGNORECASE; texts whose length changes when lowercased (rare
+    non-ASCII) fall back to an IGNORECASE copy so positions stay valid
+    """
+
+    def __init__(self, source: str):
+        self._lower = re.compile(source)
+        self._ignorecase = re.compile(source, re.IGNORECASE)
+
+
+    def finditer(self, text: str) -> Iterator["re.Match"]:
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return self._lower.finditer(lowered)
+        return self._ignorecase.finditer(text)
+
+
+class SkillMatch(NamedTuple):
+    """One occurrence of a skill in a text (skill is the canonical name)"""
+    skill: str
+    start: int
+    end: int
+
+
+class SkillMatcher:
+    """
+    Multi-pattern skill matcher compiled once per keyword list
+
+    Matching is case-insensitive. Longer keywords win, so "react native" is
+    reported as itself rather than as "react".
+
+    Args:
+        keywords: Keywords to find, or a mapping of keyword (e.g. an alias
+                  like "k8s") to the canonical skill it reports
+    """
+
+    def __init__(self, keywords: Union[Iterable[str], Mapping[str, str]]):
+        if not isinstance(keywords, Mapping):
+            keywords = {keyword: keyword for keyword in keywords}
+
+        self._canonical: Dict[str, str] = {}
+        for keyword, skill in keywords.items():
+            if keyword and keyword.strip():
+                self._canonical.setdefault(keyword.lower().strip(), skill.lower().strip())
+
+        self.keywords: Tuple[str, ...] = tuple(self._canonical)
+        self._pattern = KeywordPattern(keyword_pattern(self.keywords)) if self.keywords else None
+
+
+    def find(self, text: str) -> List[SkillMatch]:
+        """Every skill occurrence in the text, in order of position"""
+        if not text or self._pattern is None:
+            return []
+
+        return [
+            SkillMatch(self._canonical.get(m.group().lower(), m.group().lower()), m.start(), m.end())
+            for m in self._pattern.finditer(text)
+        ]
+
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Occurrences per skill, keyed in order of first appearance"""
+        counts: Dict[str, int] = {}
+        for match in self.find(text):
+            counts[match.skill] = counts.get(match.skill, 0) + 1
+        return counts
+
+
+    def extract(self, text: str) -> List[str]:
+        """Distinct skills in order of first appearance"""
+        return list(self.counts(text))
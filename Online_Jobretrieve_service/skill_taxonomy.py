@@ -0,0 +1,267 @@
+"""
+Skill Taxonomy - Canonical skills with aliases and categories
+Single source of the skill vocabulary for parsing and analytics. Loaded from
+a local JSON file or the Supabase `skills` table on top of built-in defaults,
+and compiled into an immutable, versioned snapshot that reload() swaps in
+without a restart
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from job_classifier import JobClassifier
+from skill_matcher import SkillMatcher
+
+
+class Skill(NamedTuple):
+    """A canonical skill; name is lowercase"""
+    name: str
+    category: str
+    aliases: Tuple[str, ...] = ()
+
+    @property
+    def display_name(self) -> str:
+        """Name as shown in parsed jobs, e.g. "Python" """
+        return self.name.title()
+
+
+# Built-in vocabulary: (category, [(name, aliases), ...])
+DEFAULT_SKILLS = [
+    ("Programming Language", [
+        ("python", []), ("javascript", []), ("java", []), ("c++", ["cpp"]),
+        ("c#", ["csharp", "c sharp"]), ("ruby", []), ("php", []), ("swift", []),
+        ("kotlin", []), ("go", ["golang"]), ("rust", []), ("typescript", []),
+        ("scala", []), ("r", []), ("matlab", [])
+    ]),
+    ("Framework", [
+        ("react", ["reactjs", "react.js"]), ("angular", ["angularjs"]), ("vue", ["vuejs", "vue.js"]),
+        ("django", []), ("flask", []), ("fastapi", []), ("nodejs", ["node.js", "node js"]),
+        ("express", ["expressjs", "express.js"]), ("nextjs", ["next.js"]), ("nuxt", ["nuxtjs", "nuxt.js"]),
+        ("spring", ["spring boot"]), ("laravel", []), ("rails", ["ruby on rails"])
+    ]),
+    ("Mobile", [
+        ("react native", []), ("flutter", []), ("android", []), ("ios", []), ("xamarin", [])
+    ]),
+    ("Database", [
+        ("sql", []), ("mysql", []), ("postgresql", ["postgres"]), ("mongodb", ["mongo"]),
+        ("redis", []), ("cassandra", []), ("oracle", []), ("dynamodb", []),
+        ("firebase", []), ("supabase", [])
+    ]),
+    ("Cloud Platform", [
+        ("aws", ["amazon web services"]), ("azure", ["microsoft azure"]),
+        ("gcp", ["google cloud", "google cloud platform"])
+    ]),
+    ("DevOps", [
+        ("docker", []), ("kubernetes", ["k8s"]), ("jenkins", []),
+        ("ci/cd", ["ci-cd", "cicd", "continuous integration"]), ("terraform", []),
+        ("ansible", []), ("git", []), ("github", []), ("gitlab", [])
+    ]),
+    ("Data Science/ML", [
+        ("machine learning", ["ml"]), ("deep learning", []), ("tensorflow", []), ("pytorch", []),
+        ("scikit-learn", ["sklearn", "scikit learn"]), ("pandas", []), ("numpy", []),
+        ("data analysis", []), ("nlp", ["natural language processing"])
+    ]),
+    ("API/Architecture", [
+        ("rest api", ["restful api", "rest apis", "restful apis"]), ("graphql", []), ("microservices", [])
+    ]),
+    ("Methodology/Soft Skill", [
+        ("agile", []), ("scrum", [])
+    ]),
+    ("Testing", [
+        ("testing", []), ("unit testing", ["unit tests"]), ("integration testing", ["integration tests"])
+    ]),
+    ("Other", [
+        ("linux", [])
+    ])
+]
+
+# Category values in the skills table that don't say anything useful
+_GENERIC_CATEGORIES = {"", "technical"}
+
+
+class TaxonomySnapshot:
+    """
+    One compiled version of the taxonomy
+    Never modified after construction, so readers need no locking
+    """
+
+    def __init__(self, skills: Iterable[Skill], version: int, source: str):
+        self.version = version
+        self.source = source
+        self.loaded_at = datetime.utcnow()
+        self.skills: Dict[str, Skill] = {skill.name: skill for skill in skills}
+
+        # Every surface form (canonical names first) -> canonical name
+        self.lookup: Dict[str, str] = {name: name for name in self.skills}
+        for skill in self.skills.values():
+            for alias in skill.aliases:
+                self.lookup.setdefault(alias, skill.name)
+
+        self.matcher = SkillMatcher(self.lookup)
+        self.classifier = JobClassifier(self.lookup)
+
+
+    def canonical(self, skill: str) -> Optional[str]:
+        """Canonical name for a skill name or alias, in any case"""
+        return self.lookup.get(skill.lower().strip())
+
+
+    def display_name(self, skill: str) -> str:
+        """Display name for a skill name or alias; unknown skills are returned unchanged"""
+        canonical = self.canonical(skill)
+        return self.skills[canonical].display_name if canonical else skill
+
+
+    def category_of(self, skill: str) -> str:
+        """Category for a skill name or alias (dictionary lookup)"""
+        canonical = self.canonical(skill)
+        if canonical:
+            return self.skills[canonical].category
+
+        # Skills outside the taxonomy, e.g. ones stored by an older vocabulary
+        skill_lower = skill.lower()
+        if "sql" in skill_lower:
+            return "Database"
+        if "test" in skill_lower:
+            return "Testing"
+        if "cloud" in skill_lower:
+            return "Cloud Platform"
+
+        return "Other"
+
+
+    def info(self) -> Dict:
+        """Version details for health checks"""
+        return {
+            "version": self.version,
+            "source": self.source,
+            "skills": len(self.skills),
+            "aliases": len(self.lookup) - len(self.skills),
+            "loaded_at": self.loaded_at.isoformat()
+        }
+
+
+def default_skills() -> List[Skill]:
+    """Built-in skills, used when nothing else is configured or loading fails"""
+    return [
+        Skill(name, category, tuple(aliases))
+        for category, skills in DEFAULT_SKILLS
+        for name, aliases in skills
+    ]
+
+
+def merge_skill_rows(base: List[Skill], rows: Iterable[Dict]) -> List[Skill]:
+    """
+    Overlay skill rows ({"name", "category", "aliases"}) on a skill list
+    Rows add skills and aliases; a generic category doesn't override a known one
+    """
+    merged = {skill.name: skill for skill in base}
+
+    for row in rows:
+        name = (row.get("name") or "").lower().strip()
+        if not name:
+            continue
+
+        existing = merged.get(name)
+        category = (row.get("category") or "").strip()
+        if category.lower() in _GENERIC_CATEGORIES:
+            category = existing.category if existing else "Other"
+
+        aliases = [alias.lower().strip() for alias in (row.get("aliases") or []) if alias and alias.strip()]
+        if existing:
+            aliases = list(existing.aliases) + aliases
+
+        merged[name] = Skill(name, category, tuple(dict.fromkeys(a for a in aliases if a != name)))
+
+    return list(merged.values())
+
+
+class SkillTaxonomy:
+    """
+    Loads the skill taxonomy and holds the current snapshot
+
+    Sources, in order of preference:
+        1. SKILL_TAXONOMY_FILE - JSON list of {"name", "category", "aliases"}
+           (or {"skills": [...]})
+        2. The Supabase `skills` table, when Supabase credentials are set
+        3. Built-in defaults only
+    """
+
+    def __init__(self, file_path: str = None, use_database: bool = None):
+        # Unset options are read from the environment at load time
+        self.file_path = file_path
+        self.use_database = use_database
+        self._reload_lock = threading.Lock()
+        self._version = 0
+        self._snapshot: Optional[TaxonomySnapshot] = None
+
+
+    @classmethod
+    def fixed(cls, skills: Iterable[Skill], version: int, source: str) -> "SkillTaxonomy":
+        """
+        Taxonomy pinned to a given skill list, e.g. a copy of the parent's
+        current snapshot inside a parse worker process
+        """
+        taxonomy = cls(use_database=False)
+        taxonomy._version = version
+        taxonomy._snapshot = TaxonomySnapshot(skills, version, source)
+        return taxonomy
+
+
+    def snapshot(self) -> TaxonomySnapshot:
+        """
+        Current taxonomy (loaded on first use)
+        Take it once per operation so the whole operation sees one version
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.reload()
+        return snapshot
+
+
+    def reload(self) -> TaxonomySnapshot:
+        """Load the taxonomy again and swap in a newly compiled snapshot"""
+        with self._reload_lock:
+            rows, source = self._load_rows()
+            skills = merge_skill_rows(default_skills(), rows)
+
+            self._version += 1
+            snapshot = TaxonomySnapshot(skills, self._version, source)
+
+            # Single reference assignment; readers see the old or the new snapshot
+            self._snapshot = snapshot
+
+        print(f"[TAXONOMY] Loaded v{snapshot.version} from {source}: {len(snapshot.skills)} skills")
+        return snapshot
+
+
+    def _load_rows(self) -> Tuple[List[Dict], str]:
+        file_path = self.file_path or os.getenv('SKILL_TAXONOMY_FILE')
+        use_database = (
+            self.use_database if self.use_database is not None
+            else bool(os.getenv('SUPABASE_URL') and os.getenv('SUPABASE_SERVICE_KEY'))
+        )
+
+        if file_path:
+            try:
+                with open(file_path, encoding="utf-8") as f:
+                    data = json.load(f)
+                return (data.get("skills", []) if isinstance(data, dict) else data), file_path
+            except (OSError, ValueError) as e:
+                print(f"[WARN] Could not load skill taxonomy file {file_path}: {e}")
+
+        if use_database:
+            try:
+                from job_storage import JobStorage
+                return JobStorage().get_skills(), "database"
+            except Exception as e:
+                print(f"[WARN] Could not load skill taxonomy from database: {e}")
+
+        return [], "defaults"
+
+
+# Shared taxonomy for the process
+skill_taxonomy = SkillTaxonomy()
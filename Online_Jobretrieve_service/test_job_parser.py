@@ -0,0 +1,72 @@
+"""
+Test script for job parsing (offline, no API keys needed)
+Regression checks for experience level and job type classification
+"""
+
+import sys
+
+from job_parser import JobParser
+
+
+parser = JobParser(memo=None, pool=None)
+failures = 0
+
+
+def check(label: str, actual, expected) -> None:
+    global failures
+    if actual == expected:
+        print(f"[OK] {label}: {actual}")
+    else:
+        failures += 1
+        print(f"[FAIL] {label}: got {actual!r}, expected {expected!r}")
+
+
+print("="*70)
+print("TEST 1: Experience level comes from experience keywords only")
+print("="*70)
+
+senior = parser.parse_job({
+    "id": 1,
+    "title": "Senior Backend Engineer",
+    "description": "Build our Python APIs. You will mentor an intern and review designs."
+}, "remotive")
+check("Senior posting mentioning an intern", senior["experience_level"], "senior")
+
+internship = parser.parse_job({
+    "id": 2,
+    "title": "Software Engineering Internship",
+    "description": "A summer internship on our Python team."
+}, "remotive")
+check("Internship posting", internship["experience_level"], "entry")
+
+
+print("\n" + "="*70)
+print("TEST 2: Job type comes from the API field, not from prose")
+print("="*70)
+
+prose = "We have a contract with the city. You will mentor an intern. Temporary office space."
+
+# (source, payload without a job type field, payload field for the same job)
+cases = [
+    ("jsearch", {"job_id": "j1", "job_title": "Python Developer", "job_description": prose}, "job_employment_type"),
+    ("adzuna", {"id": 1, "title": "Python Developer", "description": prose}, "contract_type"),
+    ("remotive", {"id": 1, "title": "Python Developer", "description": prose}, "job_type"),
+    ("themuse", {"id": 1, "name": "Python Developer", "contents": prose}, "type"),
+    ("arbeitnow", {"slug": "a1", "title": "Python Developer", "description": prose}, "job_types"),
+]
+
+for source, payload, field in cases:
+    check(f"{source} without {field}", parser.parse_job(payload, source)["job_type"], "full-time")
+
+    structured = dict(payload, **{field: ["Part-time"] if field == "job_types" else "Part-time"})
+    check(f"{source} with {field}", parser.parse_job(structured, source)["job_type"], "part-time")
+
+part_time_prose = parser.parse_job({"id": 3, "title": "Barista", "description": "A part-time role."}, "adzuna")
+check("Explicit part-time phrase in the text", part_time_prose["job_type"], "part-time")
+
+
+print("\n" + "="*70)
+print(f"{'ALL TESTS PASSED' if not failures else f'{failures} TEST(S) FAILED'}")
+print("="*70)
+
+sys.exit(1 if failures else 0)